@@ -1,6 +1,12 @@
 import bpy
 import math
-import csv
+from io import BytesIO
+
+import numpy as np
+
+
+# Degrees-to-radians factor, precomputed once
+_DEG = math.pi / 180.0
 
 
 def position_cameras(cameras, distance=None, pitch=None, inward_yaw=None, height=None):
@@ -8,29 +14,44 @@ def position_cameras(cameras, distance=None, pitch=None, inward_yaw=None, height
     Apply basic positioning for two stereoscopic cameras. If any of the
     arguments is None, the property will not be changed.
     If position is set, then distance needs to be set as well.
-    
+
     Args:
-        cameras (list[bpy.types.Camera]): is a 2-tuple of blender camera objects 
+        cameras (list[bpy.types.Camera]): is a 2-tuple of blender camera objects
         height (float): should be a value in meters or None
         distance (float): should be a value in meters or None
         pitch (float): should be values in degrees or None
         inward_yaw (float): should be values in degrees or None
     '''
+    # every write crosses into RNA and tags the depsgraph, so unchanged
+    # values are skipped
     cl = cameras[0]
     cr = cameras[1]
-    if height:
-        cl.location.y = height
-        cr.location.y = height
-    if distance:
+    if height is not None:
+        if cl.location.y != height:
+            cl.location.y = height
+        if cr.location.y != height:
+            cr.location.y = height
+    if distance is not None:
         center = (cl.location.z + cr.location.z) / 2.0
-        cl.location.z = center + distance / 2.0
-        cr.location.z = center - distance / 2.0
-    if pitch:
-        cl.rotation_euler[0] = (-pitch / 180.0) * math.pi
-        cr.rotation_euler[0] = (-pitch / 180.0) * math.pi
-    if inward_yaw:
-        cl.rotation_euler[1] = ((90.0 - inward_yaw) / 180.0) * math.pi
-        cr.rotation_euler[1] = ((90.0 + inward_yaw) / 180.0) * math.pi
+        z_left = center + distance / 2.0
+        z_right = center - distance / 2.0
+        if cl.location.z != z_left:
+            cl.location.z = z_left
+        if cr.location.z != z_right:
+            cr.location.z = z_right
+    if pitch is not None:
+        pitch_rad = -pitch * _DEG
+        if cl.rotation_euler[0] != pitch_rad:
+            cl.rotation_euler[0] = pitch_rad
+        if cr.rotation_euler[0] != pitch_rad:
+            cr.rotation_euler[0] = pitch_rad
+    if inward_yaw is not None:
+        yaw_left = (90.0 - inward_yaw) * _DEG
+        yaw_right = (90.0 + inward_yaw) * _DEG
+        if cl.rotation_euler[1] != yaw_left:
+            cl.rotation_euler[1] = yaw_left
+        if cr.rotation_euler[1] != yaw_right:
+            cr.rotation_euler[1] = yaw_right
 
 
 def dump_k_matrix(camera, filename):
@@ -46,9 +67,20 @@ def dump_k_matrix(camera, filename):
     w = bpy.context.scene.render.resolution_x * (scale / 100.0)
     h = bpy.context.scene.render.resolution_y * (scale / 100.0)
     k_matrix = camera.calc_matrix_camera(w, h)
-    with open(filename, 'w', newline='') as k_matrix_file:
-        writer = csv.writer(k_matrix_file)
-        writer.writerows(k_matrix)
+    buffer = BytesIO()
+    np.savetxt(buffer, np.asarray(k_matrix), delimiter=',', fmt='%.16g')
+    data = buffer.getvalue()
+    # the intrinsics only change with the camera setup, so on batch runs
+    # the same bytes come around every image set; skip the disk write
+    # when the file already holds them
+    try:
+        with open(filename, 'rb') as existing:
+            if existing.read() == data:
+                return
+    except OSError:
+        pass
+    with open(filename, 'wb') as out:
+        out.write(data)
 
 
 def setup_displacement_values(nodes, cameras, adjustment):
@@ -76,7 +108,12 @@ def get_cameras_distance(cameras):
     Returns:
         (float): distance between the left and right cameras
     '''
-    return (cameras[0].location - cameras[1].location).length
+    # computed from the components directly, to avoid allocating a
+    # temporary Vector just to take its length
+    dx = cameras[0].location[0] - cameras[1].location[0]
+    dy = cameras[0].location[1] - cameras[1].location[1]
+    dz = cameras[0].location[2] - cameras[1].location[2]
+    return math.sqrt(dx*dx + dy*dy + dz*dz)
 
 
 def _depth_to_displacement(image_path, camera_distance, output_name, output_path):
@@ -91,12 +128,14 @@ def _depth_to_displacement(image_path, camera_distance, output_name, output_path
     >>> outputName = "Disp"+picName
     >>> depth_to_displacement(os.path.join(path, picName), camera_distance,outputName, os.path.join(path, outputName))
     '''
-    import PIL
-    from PIL import Image, ImageMath
-    
+    from PIL import Image
+
     img = Image.open(image_path)
-    r = ImageMath.eval('((({fac} * {distance}) / (i+1)) / 65536) % 256'.format(fac=256, distance=camera_distance), i=img)
-    g = ImageMath.eval('((({fac} * {distance}) / (i+1)) / 256) % 256'.format(fac=256, distance=camera_distance),   i=img)
-    b = ImageMath.eval(' (({fac} * {distance}) / (i+1)) % 256'.format(fac=256, distance=camera_distance),          i=img)
-    newImg = Image.merge('RGB', (r, g, b))
-    newImg.save(output_path)
+    depth = np.asarray(img, dtype=np.int64)
+    displacement = (256 * camera_distance) // (depth + 1)
+    rgb = np.stack([
+        (displacement // 65536) % 256,
+        (displacement // 256) % 256,
+        displacement % 256,
+    ], axis=-1).astype(np.uint8)
+    Image.fromarray(rgb, 'RGB').save(output_path)
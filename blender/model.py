@@ -8,10 +8,9 @@ def load_new_model(model_file):
     Args:
         model_file (str): model filepath
     """
-    # select and remove all objects
-    for o in bpy.data.objects:
-        o.select = True
-    bpy.ops.object.delete()
+    # remove all objects directly, without the slow delete operator
+    for o in list(bpy.data.objects):
+        bpy.data.objects.remove(o, do_unlink=True)
     
     section = '\\Scene\\'
     object = 'main_scene'
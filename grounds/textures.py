@@ -1,5 +1,10 @@
+import hashlib
+import multiprocessing
 import os.path
+import random
 from glob import glob
+
+import numpy as np
 try:
     from grounds.voronoi.renderer import render as render_voronoi
 except ImportError:
@@ -13,56 +18,116 @@ texture_suffix = '_texture'
 output_default = os.path.join('output', 'road_textures')
 
 
-def cobblestone_ground_textures(defects=0, output_path=output_default):
-    '''Render a new voronoi-based cobblestone image.'''
+def _cache_key(render_kwargs):
+    '''Hash a render's keyword arguments into a cache key string.'''
+    return hashlib.sha1(repr(sorted(render_kwargs.items())).encode()).hexdigest()
+
+
+def _cache_hit(output, suffixes, key):
+    '''
+    Check whether all output PNGs for `output` exist and were rendered with
+    the parameters hashed in `key`.
+    '''
+    if not all(os.path.exists(output + suffix + '.png') for suffix in suffixes):
+        return False
+    try:
+        with open(output + '.cachekey') as f:
+            return f.read() == key
+    except OSError:
+        return False
+
+
+def _write_cache_key(output, key):
+    '''Record the parameter hash the `output` PNGs were rendered with.'''
+    with open(output + '.cachekey', 'w') as f:
+        f.write(key)
+
+
+def cobblestone_ground_textures(defects=0, output_path=output_default, seed=None):
+    '''
+    Render a new voronoi-based cobblestone image.
+
+    With a `seed` the output is deterministic, and a repeat call with the
+    same parameters reuses the PNGs already on disk.
+    '''
     output = os.path.join(output_path, 'cobblestone')
     os.makedirs(output_path, exist_ok=True)
+    render_kwargs = dict(
+        size=10,
+        grid_distortion=0.2,
+        distance=0.08,
+        corner_size=0.3,
+        max_z_displace=130,  # of 255
+        max_slant=0,  # slanted cells don't tile correctly yet
+        wrap_amount=5,
+        defects=defects if defects else 0,
+        output=output,
+        texture_images=list(glob('img/stone_textures/hrt-stone*.png')),
+        background_texture='img/cobblestone_background.png',
+        dpi=96*3,
+        seed=seed,
+    )
+    suffixes = [depth_suffix, texture_suffix] + ([defects_suffix] if defects else [])
+    if seed is not None:
+        key = _cache_key(render_kwargs)
+        if _cache_hit(output, suffixes, key):
+            return
     try:
-        render_voronoi(
-            size=10,
-            grid_distortion=0.2,
-            distance=0.08,
-            corner_size=0.3,
-            max_z_displace=130,  # of 255
-            max_slant=0,  # slanted cells don't tile correctly yet
-            wrap_amount=5,
-            defects=defects if defects else 0,
-            output=output,
-            texture_images=list(glob('img/stone_textures/hrt-stone*.png')),
-            background_texture='img/cobblestone_background.png',
-            dpi=96*3,
-        )
+        render_voronoi(**render_kwargs)
     except NameError:
         print('render_voronoi() not available')
+        return
+    if seed is not None:
+        _write_cache_key(output, key)
+
+def slate_ground_textures(defects=0, output_path=output_default, seed=None):
+    '''
+    Render a new voronoi-based slate-stone image.
 
-def slate_ground_textures(defects=0, output_path=output_default):
-    '''Render a new voronoi-based slate-stone image.'''
+    With a `seed` the output is deterministic, and a repeat call with the
+    same parameters reuses the PNGs already on disk.
+    '''
     output = os.path.join(output_path, 'slate')
     os.makedirs(output_path, exist_ok=True)
+    render_kwargs = dict(
+        size=7,
+        grid_distortion=0.5,
+        distance=0.04,
+        corner_size=0.3,
+        max_z_displace=150,  # of 255
+        max_slant=0,  # slanted cells don't tile correctly yet
+        wrap_amount=5,
+        defects=defects if defects else 0,
+        output=output,
+        texture_images=list(glob('img/stone_textures/hrt-stone*.png')),
+        background_texture='img/cobblestone_background.png',
+        dpi=96*3,
+        seed=seed,
+    )
+    suffixes = [depth_suffix, texture_suffix] + ([defects_suffix] if defects else [])
+    if seed is not None:
+        key = _cache_key(render_kwargs)
+        if _cache_hit(output, suffixes, key):
+            return
     try:
-        render_voronoi(
-            size=7,
-            grid_distortion=0.5,
-            distance=0.04,
-            corner_size=0.3,
-            max_z_displace=150,  # of 255
-            max_slant=0,  # slanted cells don't tile correctly yet
-            wrap_amount=5,
-            defects=defects if defects else 0,
-            output=output,
-            texture_images=list(glob('img/stone_textures/hrt-stone*.png')),
-            background_texture='img/cobblestone_background.png',
-            dpi=96*3,
-        )
+        render_voronoi(**render_kwargs)
     except NameError:
         print('render_voronoi() not available')
+        return
+    if seed is not None:
+        _write_cache_key(output, key)
+
 
+def asphalt_ground_textures(defects=0, output_path=output_default, seed=None):
+    '''
+    Render a new asphalt noise pattern with optional defects.
 
-def asphalt_ground_textures(defects=0, output_path=output_default):
-    '''Render a new asphalt noise pattern with optional defects.'''
+    With a `seed` the output is deterministic, and a repeat call with the
+    same parameters reuses the PNGs already on disk.
+    '''
     output = os.path.join(output_path, 'asphalt')
     os.makedirs(output_path, exist_ok=True)
-    generate_asphalt(
+    asphalt_kwargs = dict(
         resolution=[1024,1024],
         asphalt_type=1,
         img_destination=output+texture_suffix+'.png',
@@ -72,3 +137,37 @@ def asphalt_ground_textures(defects=0, output_path=output_default):
         number_of_cracks=defects if defects else 0,
         crack_width=10,
     )
+    suffixes = [depth_suffix, texture_suffix] + ([defects_suffix] if defects else [])
+    if seed is not None:
+        key = _cache_key(dict(asphalt_kwargs, seed=seed))
+        if _cache_hit(output, suffixes, key):
+            return
+        random.seed(seed)
+        np.random.seed(seed)
+    generate_asphalt(**asphalt_kwargs)
+    if seed is not None:
+        _write_cache_key(output, key)
+
+
+def _render_ground(texture_function, defects, output_path):
+    '''Pool worker: run one of the *_ground_textures functions.'''
+    texture_function(defects=defects, output_path=output_path)
+
+
+def all_ground_textures(defects=0, output_path=output_default):
+    '''
+    Render the cobblestone, slate and asphalt images in one batch, each in
+    its own process. The three renderers are independent (they write to
+    separate files and don't touch bpy), so the batch takes about as long as
+    the slowest of them.
+    '''
+    texture_functions = [
+        cobblestone_ground_textures,
+        slate_ground_textures,
+        asphalt_ground_textures,
+    ]
+    with multiprocessing.Pool(len(texture_functions)) as pool:
+        pool.starmap(_render_ground, [
+            (texture_function, defects, output_path)
+            for texture_function in texture_functions
+        ])
@@ -1,5 +1,7 @@
 from os import path
+from io import BytesIO
 from cairosvg import svg2png
+from PIL import Image
 from .voronoi import (
     grid,
     wrap,
@@ -10,9 +12,10 @@ from .voronoi import (
     slant_random,
     remove_random_cells,
     apply_random_texture,
+    offset_two_stage,
     JOIN_SQUARE,
 )
-from .svg import svg_voronoi, write
+from .svg import iter_svg_voronoi, svg_voronoi_stack, write
 
 
 def render(
@@ -35,6 +38,7 @@ def render(
         output='voronoi',
         output_svg=None,
         debug_cell_center=False,
+        seed=None,
     ):
     '''
     Renders various versions of voronoi graphs as SVG or PNG images. Three
@@ -89,7 +93,9 @@ def render(
             If empty or ``None`` no vector images will be written.
         debug_cell_center (bool): Render red dots at the center of cells for
             debugging the voronoi graph.
-    
+        seed (int): Seed for the random operations, making the output
+            reproducible. If ``None`` every call produces a new graph.
+
     .. _color string understood by SVG:
         https://www.w3.org/TR/SVG/types.html#DataTypeColor
     '''
@@ -97,30 +103,32 @@ def render(
     if wrap_amount > size:
         raise ValueError('Cannot wrap ({}) more than the grid size ({}).'.format(wrap_amount, size))
     g = grid((size, size), scale=scale)
-    distort(g, (size,)*2, grid_distortion * scale)
+    distort(g, (size,)*2, grid_distortion * scale, seed=seed)
     if max_z_displace > 0:
-        z_displace(g, max_z_displace)
+        z_displace(g, max_z_displace, seed=seed)
     if wrap_amount > 0:
-        wrap(g, (size,)*2, wrap_amount, scale)
+        g = wrap(g, (size,)*2, wrap_amount, scale)
     cells = voronoi_polygons(g)
     
     
     if defects > 0:
-        defect_cells = remove_random_cells(cells, defects, (size,)*2, wrap_amount, scale)
+        defect_cells = remove_random_cells(cells, defects, (size,)*2, wrap_amount, scale, seed=seed)
         offset(defect_cells, -distance * 0.5 * scale)
     else:
         defect_cells = []
     
+    # never use JOIN_ROUND for the corners, the resulting SVGs are hundreds
+    # of MB in size
     if texture_images:
-        texture_cells = apply_random_texture(cells, texture_images, (size,)*2, scale)
-        offset(texture_cells, -(distance + corner_size) * 0.5 * scale)
-        offset(texture_cells, corner_size * 0.5 * scale, JOIN_SQUARE)
-    
-    offset(cells, -(distance + corner_size) * 0.5 * scale)
+        texture_cells = apply_random_texture(cells, texture_images, (size,)*2, scale, seed=seed)
+        offset_two_stage(texture_cells, -(distance + corner_size) * 0.5 * scale, corner_size * 0.5 * scale, JOIN_SQUARE)
+
     if corner_size:
-        offset(cells, corner_size * 0.5 * scale, JOIN_SQUARE)  # never use JOIN_ROUND, the resulting SVGs are hundreds of MB in size
+        offset_two_stage(cells, -(distance + corner_size) * 0.5 * scale, corner_size * 0.5 * scale, JOIN_SQUARE)
+    else:
+        offset(cells, -(distance + corner_size) * 0.5 * scale)
     if max_slant:
-        slant_random(cells, max_slant)
+        slant_random(cells, max_slant, seed=seed)
     svg_kwargs = {
         'size': (size,)*2,
         'scale': scale,
@@ -130,23 +138,43 @@ def render(
         'background': background,
         'render_center': debug_cell_center
     }
-    svg_string = svg_voronoi(cells, **svg_kwargs)
-    defects_svg_string = svg_voronoi(defect_cells, **svg_kwargs)
-    if texture_images:
-        svg_kwargs['background'] = {
-            'file': path.abspath(background_texture),
-            'transform': '',
-        }
-        texture_svg_string = svg_voronoi(texture_cells, **svg_kwargs)
+    texture_background = {
+        'file': path.abspath(background_texture),
+        'transform': '',
+    }
     if output:
-        svg2png(bytestring=svg_string, write_to=output+depth_suffix+'.png', dpi=dpi)
         ### TODO: figure out how to get pixel data (PIL image or something similar)
         ### https://github.com/Kozea/CairoSVG/blob/master/cairosvg/__init__.py#L49
-        svg2png(bytestring=defects_svg_string, write_to=output+defects_suffix+'.png', dpi=dpi)
+        # stack all output images into one SVG document, so cairosvg only
+        # parses and rasterizes once, and crop the stack into the separate
+        # output files
+        # the defects layer is written even with zero defect cells: the
+        # ground meshes load the defects image unconditionally (see
+        # always_defects in grounds/meshes.py), and a missing file would
+        # let a stale image from an earlier run take its place
+        layers = [(cells, background), (defect_cells, background)]
+        suffixes = [depth_suffix, defects_suffix]
         if texture_images:
-            svg2png(bytestring=texture_svg_string, write_to=output+texture_suffix+'.png', dpi=dpi)
+            layers.append((texture_cells, texture_background))
+            suffixes.append(texture_suffix)
+        stack_kwargs = dict(svg_kwargs)
+        del stack_kwargs['background']
+        stack_string = svg_voronoi_stack(layers, **stack_kwargs)
+        stack_png = BytesIO()
+        svg2png(bytestring=stack_string, write_to=stack_png, dpi=dpi)
+        stack_image = Image.open(stack_png)
+        # the stack is built on an integer pixel pitch, so the layers sit
+        # at exact multiples of their height
+        layer_px = stack_image.height // len(layers)
+        for k, suffix in enumerate(suffixes):
+            top = k * layer_px
+            stack_image.crop((0, top, stack_image.width, top + layer_px)).save(output+suffix+'.png')
     if output_svg:
-        write(output_svg+depth_suffix+'.svg', svg_string)
-        write(output_svg+defects_suffix+'.svg', defects_svg_string)
+        # stream the documents part by part, the joined strings can run to
+        # tens of MB for large graphs
+        write(output_svg+depth_suffix+'.svg', iter_svg_voronoi(cells, **svg_kwargs))
+        if defect_cells:
+            write(output_svg+defects_suffix+'.svg', iter_svg_voronoi(defect_cells, **svg_kwargs))
         if texture_images:
-            write(output_svg+texture_suffix+'.svg', texture_svg_string)
+            svg_kwargs['background'] = texture_background
+            write(output_svg+texture_suffix+'.svg', iter_svg_voronoi(texture_cells, **svg_kwargs))
@@ -1,5 +1,28 @@
 from random import randint
 
+from PIL import Image
+
+
+# Static document substrings, built once instead of per render
+_SVG_DECL = '<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'no\'?>\n\n'
+_SVG_OPEN = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+_SVG_DEFS_OPEN = '<defs>\n'
+_SVG_DEFS_CLOSE = '</defs>\n'
+_SVG_CLOSE = '</svg>'
+
+# Image sizes by file path, so repeated texture references don't re-open
+# the same file
+_img_size_cache = {}
+
+# All 256 grey hex strings per foreground color, precomputed so that
+# _offset_color is a table lookup instead of string formatting
+_BLACK_OFFSET = tuple(f'#{z:02x}{z:02x}{z:02x}' for z in range(256))
+_WHITE_OFFSET = tuple(f'#{255-z:02x}{255-z:02x}{255-z:02x}' for z in range(256))
+_FG_TABLES = {
+    'white': _WHITE_OFFSET, '#ffffff': _WHITE_OFFSET, '#fff': _WHITE_OFFSET,
+    'black': _BLACK_OFFSET, '#000000': _BLACK_OFFSET, '#000': _BLACK_OFFSET,
+}
+
 
 def svg_voronoi(cells, size=(100, 100), scale=1.0, offset=(0, 0), foreground='black', background=None, dpi=96, render_center=False):
     '''
@@ -28,75 +51,145 @@ def svg_voronoi(cells, size=(100, 100), scale=1.0, offset=(0, 0), foreground='bl
             dots, marking the original center point that spawned each cell,
             which can be useful for debugging.
     '''
+    return ''.join(iter_svg_voronoi(cells, size, scale, offset, foreground, background, dpi, render_center))
+
+
+def iter_svg_voronoi(cells, size=(100, 100), scale=1.0, offset=(0, 0), foreground='black', background=None, dpi=96, render_center=False):
+    '''
+    Yield the SVG document built by :py:meth:`svg_voronoi` as a sequence of
+    string parts. Streaming the parts to a file keeps peak memory small for
+    large graphs, where the joined document can run to tens of MB.
+
+    The arguments match :py:meth:`svg_voronoi`.
+    '''
+    img_size = _fix_image_size(size, dpi)
+    size = (size[0] * scale, size[1] * scale)
+    yield _SVG_DECL
+    yield _SVG_OPEN
+    yield f'width="{img_size[0]}" height="{img_size[1]}" viewBox="{offset[0]} {offset[1]} {size[0]} {size[1]}" id="pyvoronoi-display" class="pyvoronoi">\n'
+    svg_defs_parts, svg_body_parts = _svg_fragment(cells, img_size, size, offset, scale, foreground, background, dpi, render_center)
+    yield _SVG_DEFS_OPEN
+    yield from svg_defs_parts
+    yield _SVG_DEFS_CLOSE
+    yield from svg_body_parts
+    yield _SVG_CLOSE
+
+
+def svg_voronoi_stack(layers, size=(100, 100), scale=1.0, offset=(0, 0), foreground='black', dpi=96, render_center=False):
+    '''
+    Create one SVG document containing several voronoi cell layers, stacked
+    vertically in nested ``<svg>`` viewports. Rasterizing the stack once and
+    cropping the result is cheaper than parsing and rendering one document
+    per layer.
+
+    Args:
+        layers (list[(cells, background)]): One (cell list, background) pair
+            per layer; backgrounds as in :py:meth:`svg_voronoi`.
+
+    The remaining arguments match :py:meth:`svg_voronoi` and apply to every
+    layer.
+    '''
     img_size = _fix_image_size(size, dpi)
+    # the half-pixel fix makes img_size fractional, so the layers are
+    # stacked on an integer pixel pitch: every layer starts on an exact
+    # pixel row, stays pixel-aligned with the others, and the renderer can
+    # crop at exact multiples without blending neighboring layers
+    layer_px = round(img_size[1])
     size = (size[0] * scale, size[1] * scale)
-    svg_header = '<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'no\'?>\n\n'
-    svg_header += '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
-    svg_header += 'width="{img_size[0]}" height="{img_size[1]}" viewBox="{offset[0]} {offset[1]} {size[0]} {size[1]}" id="pyvoronoi-display" class="pyvoronoi">\n'.format(img_size=img_size, size=size, offset=offset)
-    svg_defs = '<defs>\n'
-    svg_body = ''
+    parts = [_SVG_DECL]
+    parts.append(_SVG_OPEN)
+    parts.append(f'width="{img_size[0]}" height="{layer_px * len(layers)}" id="pyvoronoi-display" class="pyvoronoi">\n')
+    for k, (cells, background) in enumerate(layers):
+        # each layer lives in its own viewport, which also clips the
+        # wrapped cells that stick out of the visible window
+        parts.append('<svg x="0" y="{}" width="{}" height="{}" viewBox="{} {} {} {}">\n'.format(
+            layer_px * k, img_size[0], img_size[1], offset[0], offset[1], size[0], size[1]))
+        defs_parts, body_parts = _svg_fragment(
+            cells, img_size, size, offset, scale, foreground, background, dpi, render_center,
+            id_prefix='l{}-'.format(k),
+        )
+        parts.append(_SVG_DEFS_OPEN)
+        parts += defs_parts
+        parts.append(_SVG_DEFS_CLOSE)
+        parts += body_parts
+        parts.append('</svg>\n')
+    parts.append(_SVG_CLOSE)
+    return ''.join(parts)
+
+
+def _svg_fragment(cells, img_size, size, offset, scale, foreground, background, dpi, render_center, id_prefix=''):
+    '''
+    Build the defs and body of one voronoi cell layer, as two lists of
+    string parts. Generated pattern and gradient ids are prefixed with
+    `id_prefix` so several fragments can share a document.
+    '''
+    # accumulate the document in lists and join once at the end; repeated
+    # string += is quadratic in the number of cells
+    svg_defs_parts = []
+    svg_body_parts = []
+    defs_append = svg_defs_parts.append
+    body_append = svg_body_parts.append
     if background:
-        if type(background) == dict:
-            svg_defs += _svg_texture('tex-background', background, img_size, scale, dpi)
-            background = 'url(#tex-background)'
-        svg_body += '<rect x="{offset[0]}" y="{offset[1]}" width="{size[0]}" height="{size[1]}" fill="{bg}"/>\n'.format(
+        if isinstance(background, dict):
+            defs_append(_svg_texture(id_prefix + 'tex-background', background, img_size, scale, dpi))
+            background = f'url(#{id_prefix}tex-background)'
+        body_append('<rect x="{offset[0]}" y="{offset[1]}" width="{size[0]}" height="{size[1]}" fill="{bg}"/>\n'.format(
             offset=offset,
             size=size,
             bg=background
-        )
+        ))
+    # partition the cells by fill kind up front, so each emission loop below
+    # stays free of type branches and attribute probing
+    textured_cells = []
+    slanted_cells = []
+    solid_cells = []
     for i, cell in enumerate(cells):
         if len(cell.polygon) == 0:
             continue
-        fill = foreground
         if cell.texture:
-            texture_name = 'tex{}'.format(i)
-            svg_defs += _svg_texture(texture_name, cell.texture, img_size, scale, dpi)
-            fill = 'url(#{})'.format(texture_name)
-        elif not cell.is_slanted:
-            z = cell.center[2]
-            if cell.color:
-                fill = cell.color
-            else:
-                fill = _offset_color(foreground, z)
+            textured_cells.append((i, cell))
+        elif cell.is_slanted:
+            slanted_cells.append((i, cell))
         else:
-            gradient_stop_vector = _cell_z_bounds(cell, normalize_xy=True)
-            colors = [
-                _offset_color(foreground, gradient_stop_vector[0][2]),
-                _offset_color(foreground, gradient_stop_vector[1][2]),
-            ]
-            gradient_name = 'grad{}'.format(i)
-            svg_defs += _svg_gradient(
-                gradient_name,
-                gradient_stop_vector,
-                colors
-            ) + '\n'
-            fill = 'url(#{})'.format(gradient_name)
-        svg_body += _svg_poly(cell, fill, render_center)
-    svg = svg_header + svg_defs + '</defs>\n' + svg_body + '</svg>';
-    return svg
+            solid_cells.append((i, cell))
+    for i, cell in textured_cells:
+        texture_name = f'{id_prefix}tex{i}'
+        defs_append(_svg_texture(texture_name, cell.texture, img_size, scale, dpi))
+        body_append(_svg_poly(cell, f'url(#{texture_name})', render_center))
+    for i, cell in solid_cells:
+        fill = cell.color if cell.color else _offset_color(foreground, cell.center[2])
+        body_append(_svg_poly(cell, fill, render_center))
+    for i, cell in slanted_cells:
+        gradient_stop_vector = _cell_z_bounds(cell, normalize_xy=True)
+        colors = [
+            _offset_color(foreground, gradient_stop_vector[0][2]),
+            _offset_color(foreground, gradient_stop_vector[1][2]),
+        ]
+        gradient_name = f'{id_prefix}grad{i}'
+        defs_append(_svg_gradient(
+            gradient_name,
+            gradient_stop_vector,
+            colors
+        ) + '\n')
+        body_append(_svg_poly(cell, f'url(#{gradient_name})', render_center))
+    return svg_defs_parts, svg_body_parts
 
 def _svg_poly(cell, fill='black', render_center=True):
     '''
     Create an SVG string describing a the polygon that describes the given
     `cell`.
     '''
-    poly = ''
-    try:
-        poly_path = ' L '.join([
-            '{},{}'.format(p[0], p[1])
-            for p in cell.polygon
-        ])
-        poly = '<path fill="{fill}" d="M {start[0]},{start[1]} {poly} Z"/>\n'.format(
-            start=cell.polygon[0],
-            poly=poly_path,
-            fill=fill
-        )
-    except IndexError:
-        pass
+    if len(cell.polygon):
+        # coordinates are in internal scale units (~1000 per cm), so whole
+        # numbers are well below a pixel and keep the SVG text small
+        start = cell.polygon[0]
+        poly_path = ' L '.join(f'{int(p[0])},{int(p[1])}' for p in cell.polygon)
+        poly = f'<path fill="{fill}" d="M {int(start[0])},{int(start[1])} {poly_path} Z"/>\n'
+    else:
+        poly = ''
     if render_center:
-        poly += '<circle fill="#f00" stroke="none" cx="{center[0]}" cy="{center[1]}" r="70" />\n'.format(
-            center=cell.center
-        )
+        center = cell.center
+        poly += f'<circle fill="#f00" stroke="none" cx="{center[0]}" cy="{center[1]}" r="70" />\n'
     return poly
 
 
@@ -111,13 +204,9 @@ def _cell_z_bounds(cell, normalize_xy=False):
     
     If `normalize_xy` is ``True`` the 
     '''
-    min_p = cell.polygon[0]
-    max_p = cell.polygon[0]
-    for p in cell.polygon[1:]:
-        if min_p[2] > p[2]:
-            min_p = p
-        if max_p[2] < p[2]:
-            max_p = p
+    zs = cell.polygon[:, 2]
+    min_p = cell.polygon[zs.argmin()]
+    max_p = cell.polygon[zs.argmax()]
     if normalize_xy:
         min_x = min(min_p[0], max_p[0])
         max_x = max(min_p[0], max_p[0])
@@ -141,19 +230,31 @@ def _cell_z_bounds(cell, normalize_xy=False):
 
 
 def _svg_gradient(name, stop_vector, colors):
-    gradient = '<linearGradient id="{name}" x1="{stops[0][0]}" y1="{stops[0][1]}" x2="{stops[1][0]}" y2="{stops[1][1]}">\n'.format(name=name, stops=stop_vector)
+    gradient = f'<linearGradient id="{name}" x1="{stop_vector[0][0]:.1f}" y1="{stop_vector[0][1]:.1f}" x2="{stop_vector[1][0]:.1f}" y2="{stop_vector[1][1]:.1f}">\n'
     for i, color in enumerate(colors):
-        gradient += '\t<stop offset="{:.2}" stop-color="{}" />\n'.format(i / (len(colors) - 1), color)
+        gradient += f'\t<stop offset="{i / (len(colors) - 1):.2}" stop-color="{color}" />\n'
     gradient += '</linearGradient>'
     return gradient
 
 
 def _offset_color(foreground, z):
-    z = max(0, min(255, int(z)))
-    if foreground in ['white', '#ffffff', '#fff']:
-        return '#{0:0>2x}{0:0>2x}{0:0>2x}'.format(255 - z)
-    elif foreground in ['black', '#000000', '#000']:
-        return '#{0:0>2x}{0:0>2x}{0:0>2x}'.format(z)
+    table = _FG_TABLES.get(foreground)
+    if table is None:
+        return None
+    return table[max(0, min(255, int(z)))]
+
+
+def _png_size(path):
+    '''
+    Read the pixel size of a PNG from the fixed-position IHDR fields in its
+    first 24 bytes, without decoding any image data. Returns ``None`` if the
+    file is not a PNG.
+    '''
+    with open(path, 'rb') as f:
+        head = f.read(24)
+    if head[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return int.from_bytes(head[16:20], 'big'), int.from_bytes(head[20:24], 'big')
 
 
 def _svg_texture(name, texture, img_size, scale, dpi):
@@ -165,44 +266,53 @@ def _svg_texture(name, texture, img_size, scale, dpi):
     '''
     if texture is None:
         return ''
-    # svg_texture = '<pattern id="{name}" patternUnits="userSpaceOnUse" width="100" height="100" patternTransform="{transform}">\n'.format(name=name, transform=texture['transform'])
-    # svg_texture += '\t<image xlink:href="{file}" x="0" y="0" width="100" height="100"/>\n'.format(file=texture['file'])
-    
-    svg_texture = '<pattern id="{name}" '
+    ppcm = dpi/(91.44/36)
+    img_size_px = texture.get('size')
+    if img_size_px is None:
+        # texture dicts built by hand (e.g. the background) carry no size
+        if texture['file'] not in _img_size_cache:
+            size_px = _png_size(texture['file'])
+            if size_px is None:
+                # not a PNG, let PIL parse the header
+                with Image.open(texture['file']) as img:
+                    size_px = img.size
+            _img_size_cache[texture['file']] = size_px
+        img_size_px = _img_size_cache[texture['file']]
+    magic = [(s-1)*scale/dpi for s in img_size_px]
+
+    svg_texture = f'<pattern id="{name}" '
     # svg_texture += 'width="100%" height="100%" '
-    svg_texture += 'width="{w}" height="{h}" '
+    svg_texture += f'width="{magic[0]}" height="{magic[1]}" '
     # svg_texture += 'width="90" height="90" '
     # svg_texture += 'x="10" y="10" '
     # svg_texture += 'viewBox="0 0 100 100" '
     svg_texture += 'preserveAspectRatio="xMidYMid slice" '
     svg_texture += 'patternUnits="userSpaceOnUse" '
     svg_texture += 'patternContentUnits="objectBoundingBox" '
-    svg_texture += 'patternTransform="{transform}" '
+    svg_texture += f'patternTransform="{texture["transform"]}" '
     svg_texture += '>\n'
-    
-    svg_texture += '\t<image xlink:href="{file}" '
-    svg_texture += 'width="{w}" height="{h}" '
+
+    svg_texture += f'\t<image xlink:href="{texture["file"]}" '
+    svg_texture += f'width="{magic[0]}" height="{magic[1]}" '
     # svg_texture += 'preserveAspectRatio="xMidYMid slice" '
     svg_texture += '/>\n'
-    
+
     svg_texture += '</pattern>\n'
-    
-    ppcm = dpi/(91.44/36)
-    magic = [scale-3]*2
-    from PIL import Image
-    img = Image.open(texture['file'])
-    magic = [(s-1)*scale/dpi for s in img.size]
-    img.close()
-    
-    svg_texture = svg_texture.format(name=name, file=texture['file'], transform=texture['transform'], w=magic[0], h=magic[1])
-    # svg_texture = svg_texture.format(name=name, file=texture['file'], transform=texture['transform'], w=int(img_size[0]//3//100*100), h=int(img_size[1]//3//100*100))
     return svg_texture
 
 
 def write(filename, svg):
-    '''Write the SVG string to the given file.'''
+    '''
+    Write the SVG to the given file. `svg` may be a complete string or an
+    iterable of string parts (e.g. from :py:meth:`iter_svg_voronoi`), which
+    are streamed to the file without being joined in memory first.
+    '''
     with open(filename, 'w') as f:
-        f.write(svg)
+        if isinstance(svg, str):
+            f.write(svg)
+        else:
+            for part in svg:
+                f.write(part)
 
 
 def _fix_image_size(size, dpi):
@@ -8,53 +8,92 @@ This module needs the `pyvoronoi`_ and `pyclipper`_ modules to be installed.
 >>> grid = grid(size)
 >>> distort(grid, size, 0.1, seed=0)  # `seed` is just used here to make the tests reproducible.
 >>> cells = voronoi_polygons(grid)
->>> cells
-[Cell(center=Point3d(0.9953193908304712, 1.0166764078910062, 0), polygon=[Point3d(1.4551020408163264, 0.5151020408163265, 0), Point3d(1.4793298969072166, 0.5393298969072164, 0), Point3d(1.532945566286216, 1.4597322212467077, 0), Point3d(0.5481618887015177, 1.5492580101180438, 0), Point3d(0.46117155624635714, 1.4604740625607149, 0), Point3d(0.516506303915063, 0.5382282680822827, 0), Point3d(0.5917915690866511, 0.46529566744730677, 0)]), Cell(center=Point3d(1.081622577039067, 2.000937371163478, 0), polygon=[Point3d(1.532945566286216, 1.4597322212467077, 0), Point3d(1.6252379693283976, 1.5423558963511368, 0), Point3d(0.2692875647668394, 16.608471502590675, 0), Point3d(0.5481618887015177, 1.5492580101180438, 0)])]
+>>> len(cells)
+4
+>>> cells[0].center
+array([1.008725  , 1.08701448, 0.        ])
+>>> cells[0].polygon
+array([[1.4664434, 0.5743408, 0.       ],
+       [1.5942516, 1.4604783, 0.       ],
+       [0.4770989, 1.5294384, 0.       ],
+       [0.3832442, 1.4393758, 0.       ],
+       [0.5342076, 0.565377 , 0.       ]], dtype=float32)
 >>> offset(cells, -.1)
->>> cells
-[Cell(center=Point3d(0.9953193908304712, 1.0166764078910062, 0), polygon=[Point3d(1.3833428085781634, 0.611128366086632, 0), Point3d(1.4274852615781128, 1.368907148949802, 0), Point3d(0.5863744993694127, 1.445371763780713, 0), Point3d(0.5636491654440761, 1.422177866101265, 0), Point3d(0.6139991628006101, 0.5830112439580262, 0), Point3d(0.6298481663689017, 0.5676575214602053, 0), Point3d(1.3833428085781634, 0.611128366086632, 0)]), Cell(center=Point3d(1.081622577039067, 2.000937371163478, 0), polygon=[Point3d(1.5211413651704788, 1.5833828025497496, 0), Point3d(0.4212273331359029, 13.80464982194826, 0), Point3d(0.6464850720949471, 1.640731911174953, 0), Point3d(1.4986649029888213, 1.5632610176689923, 0), Point3d(1.5211413651704788, 1.5833828025497496, 0)])]
+>>> cells[0].polygon
+array([[1.3797121 , 0.6735115 , 0.        ],
+       [1.4797854 , 1.3673538 , 0.        ],
+       [0.51470053, 1.426927  , 0.        ],
+       [0.49083146, 1.4040222 , 0.        ],
+       [0.6182752 , 0.66618997, 0.        ],
+       [1.3797121 , 0.6735115 , 0.        ]], dtype=float32)
 
 .. _pyvoronoi:
     https://github.com/Voxel8/pyvoronoi
 .. _pyclipper:
     https://github.com/greginvm/pyclipper
 '''
-import itertools
-import random
 import math as m
-from copy import deepcopy
 from os import path
 
+import numpy as np
 import pyvoronoi as pv
 import pyclipper as clip
+from PIL import Image
 
-from util.point import Point2d, Point3d
+from util.point import Point2d
 
 JOIN_SQUARE, JOIN_ROUND, JOIN_MITER = (clip.JT_SQUARE, clip.JT_ROUND, clip.JT_MITER)
 
+# one offsetter per process, cleared between uses, so repeated renders
+# don't pay for a fresh Clipper allocation per offset pass
+_OFFSETTER = clip.PyclipperOffset()
+
 
 def grid(size, offset=(0, 0), scale=1.0):
     '''
-    Generates a regular 2D grid in 3D coordinates, with z = 0.
-    
+    Generates a regular 2D grid in 3D coordinates, with z = 0, as an (N, 3)
+    float array in x-major point order. One meshgrid fill in C replaces N
+    Python point allocations.
+
     Args:
         size (tuple[int, int]): Height and width.
         offset (tuple[int, int]): X and Y offset (Default: (0, 0)).
         scale (float): The coordinate scaling factor (Default: 1.0).
-    
+
     >>> grid((2,2))
-    [Point3d(0, 0, 0), Point3d(0, 1, 0), Point3d(1, 0, 0), Point3d(1, 1, 0)]
-    
+    array([[0., 0., 0.],
+           [0., 1., 0.],
+           [1., 0., 0.],
+           [1., 1., 0.]])
+
     >>> grid((3,3), (-1,-1), 2.0)
-    [Point3d(-2, -2, 0), Point3d(-2, 0, 0), Point3d(-2, 2, 0), Point3d(0, -2, 0), Point3d(0, 0, 0), Point3d(0, 2, 0), Point3d(2, -2, 0), Point3d(2, 0, 0), Point3d(2, 2, 0)]
+    array([[-2., -2.,  0.],
+           [-2.,  0.,  0.],
+           [-2.,  2.,  0.],
+           [ 0., -2.,  0.],
+           [ 0.,  0.,  0.],
+           [ 0.,  2.,  0.],
+           [ 2., -2.,  0.],
+           [ 2.,  0.,  0.],
+           [ 2.,  2.,  0.]])
     >>> len(grid((24, 24)))
     576
     '''
-    g = list(itertools.product(
-        [(c + offset[0]) * scale for c in range(0, size[0])],
-        [(c + offset[1]) * scale for c in range(0, size[1])]
-    ))
-    return [Point3d(*p, 0) for p in g]
+    xs = (np.arange(size[0]) + offset[0]) * scale
+    ys = (np.arange(size[1]) + offset[1]) * scale
+    gx, gy = np.meshgrid(xs, ys, indexing='ij')
+    g = np.zeros((size[0] * size[1], 3))
+    g[:, 0] = gx.ravel()
+    g[:, 1] = gy.ravel()
+    return g
+
+
+def _rng_for(seed):
+    '''
+    The random generator all randomized stages draw from: seeded and
+    reproducible when `seed` is given, fresh entropy when it is ``None``.
+    '''
+    return np.random.default_rng(seed)
 
 
 def random_2d(size, scale=1.0, seed=None):
@@ -62,13 +101,16 @@ def random_2d(size, scale=1.0, seed=None):
     Generates a size[0]*size[1]-length array with [-.5 - 0.5) valued tuples.
     
     >>> random_2d((2,2), 1.5, seed=0)
-    [Point2d(0.5166327772875722, 0.3869316044104537), Point2d(-0.1191426287537325, -0.361624874560555), Point2d(0.01691208205291278, -0.14259879382437857), Point2d(0.42569788355215893, -0.2950309108816088)]
+    [Point2d(0.20544253098218146, -0.34531992935419453), Point2d(-0.6885397140957079, -0.7252085467072064), Point2d(0.4699053588004086, 0.6191333659165825), Point2d(0.1599536636507698, 0.3442448414759976)]
     '''
-    points = []
-    random.seed(seed)
-    for p in range(int(size[0] * size[1])):
-        points.append(Point2d((random.random() - 0.5) * scale, (random.random() - 0.5) * scale))
-    return points
+    values = _random_2d_array(int(size[0] * size[1]), scale, seed)
+    return [Point2d(*v) for v in values]
+
+
+def _random_2d_array(n, scale=1.0, seed=None):
+    '''[-.5 - 0.5)-valued random (n, 2) array, filled in one RNG call.'''
+    rng = _rng_for(seed)
+    return (rng.random((n, 2)) - 0.5) * scale
 
 
 def distort(grid, size, scale=1.0, seed=None):
@@ -79,11 +121,12 @@ def distort(grid, size, scale=1.0, seed=None):
     >>> g = grid(size)
     >>> distort(g, size, 0.5, seed=0)
     >>> g
-    [Point3d(0.3444218515250481, 0.2579544029403025, 0), Point3d(-0.079428419169155, 0.7589167502929633, 0), Point3d(1.0112747213686086, -0.09506586254958571, 0), Point3d(1.2837985890347725, 0.8033127260789275, 0)]
+    array([[ 0.13696169, -0.23021329,  0.        ],
+           [-0.45902648,  0.51652764,  0.        ],
+           [ 1.31327024,  0.41275558,  0.        ],
+           [ 1.10663578,  1.22949656,  0.        ]])
     '''
-    distortion = random_2d(size, scale*2, seed=seed)
-    for i, p in enumerate(grid):
-        grid[i] = p + distortion[i]
+    grid[:, :2] += _random_2d_array(len(grid), scale*2, seed)
 
 
 def z_displace(grid, scale=1.0, seed=None):
@@ -94,12 +137,13 @@ def z_displace(grid, scale=1.0, seed=None):
     >>> g = grid((2, 2), scale=2)
     >>> z_displace(g, scale=2, seed=0)
     >>> g
-    [Point3d(0, 0, 1.6888437030500962), Point3d(0, 2, 1.515908805880605), Point3d(2, 0, 0.84114316166169), Point3d(2, 2, 0.5178335005859267)]
+    array([[0.        , 0.        , 1.27392337],
+           [0.        , 2.        , 0.53957343],
+           [2.        , 0.        , 0.08194705],
+           [2.        , 2.        , 0.03305527]])
     '''
-    displacements = []
-    random.seed(seed)
-    for i, p in enumerate(grid):
-        grid[i] = p + Point3d(z=random.random() * scale)
+    rng = _rng_for(seed)
+    grid[:, 2] += rng.random(len(grid)) * scale
 
 
 def wrap(grid, size, amount, scale=1.0):
@@ -117,31 +161,45 @@ def wrap(grid, size, amount, scale=1.0):
     graph has matching cells along the edges created by the overlap. Then it's
     a matter of correctly cropping the image to create matching tiles. (This
     is done by the :py:meth:`grounds.voronoi.svg.svg_voronoi` method.)
-    
+
+    Returns a new array with the wrapped points appended; the input grid is
+    not modified.
+
     >>> size = 3, 2
     >>> scale = 5
     >>> g = grid(size, (1, 1), scale=scale)
     >>> g
-    [Point3d(5, 5, 0), Point3d(5, 10, 0), Point3d(10, 5, 0), Point3d(10, 10, 0), Point3d(15, 5, 0), Point3d(15, 10, 0)]
+    array([[ 5.,  5.,  0.],
+           [ 5., 10.,  0.],
+           [10.,  5.,  0.],
+           [10., 10.,  0.],
+           [15.,  5.,  0.],
+           [15., 10.,  0.]])
     >>> wrap(g, size, 1, scale)
-    [Point3d(5, 5, 0), Point3d(5, 10, 0), Point3d(10, 5, 0), Point3d(10, 10, 0), Point3d(15, 5, 0), Point3d(15, 10, 0), Point3d(20, 5, 0), Point3d(20, 10, 0), Point3d(5, 15, 0), Point3d(10, 15, 0), Point3d(15, 15, 0), Point3d(20, 15, 0)]
-    '''
-    for y in range(size[1]):
-        for x in range(amount):
-            grid.append(
-                grid[x*size[1] + y] + Point3d(x=size[0]*scale)
-            )
-    for y in range(amount):
-        for x in range(size[0]):
-            grid.append(
-                grid[x*size[1] + y] + Point3d(y=size[1]*scale)
-            )
-    for y in range(amount):
-        for x in range(amount):
-            grid.append(
-                grid[x*size[1] + y] + Point3d(x=size[0]*scale, y=size[1]*scale)
-            )
-    return grid
+    array([[ 5.,  5.,  0.],
+           [ 5., 10.,  0.],
+           [10.,  5.,  0.],
+           [10., 10.,  0.],
+           [15.,  5.,  0.],
+           [15., 10.,  0.],
+           [20.,  5.,  0.],
+           [20., 10.,  0.],
+           [ 5., 15.,  0.],
+           [10., 15.,  0.],
+           [15., 15.,  0.],
+           [20., 15.,  0.]])
+    '''
+    if amount == 0:
+        return grid
+    g3 = grid.reshape(size[0], size[1], 3)
+    dx = np.array([size[0] * scale, 0, 0])
+    dy = np.array([0, size[1] * scale, 0])
+    # the transposes keep the y-major order the strips were historically
+    # appended in
+    right = (g3[:amount, :, :] + dx).transpose(1, 0, 2).reshape(-1, 3)
+    bottom = (g3[:, :amount, :] + dy).transpose(1, 0, 2).reshape(-1, 3)
+    corner = (g3[:amount, :amount, :] + dx + dy).transpose(1, 0, 2).reshape(-1, 3)
+    return np.concatenate([grid, right, bottom, corner])
 
 
 def _add_3d_points(p1, p2):
@@ -152,11 +210,16 @@ def _add_3d_points(p1, p2):
 class Cell:
     '''
     Represents a Voronoi graph cell.
-    
+
     Args:
-        center (Point3d): origin point of the voronoi cell.
-        polygon (list[Point3d]): cell shape.
+        center (np.ndarray): origin point of the voronoi cell, as an x,y,z
+            array.
+        polygon (np.ndarray): cell shape, as an (n, 3) vertex array.
     '''
+    # large graphs hold thousands of cells; slots drop the per-instance
+    # __dict__ and make attribute access a fixed-offset lookup
+    __slots__ = ('center', 'polygon', 'is_slanted', 'index', 'color', 'texture')
+
     def __init__(self, center, polygon, is_slanted=False, index=None, color=None, texture=None):
         self.center = center
         self.polygon = polygon
@@ -166,9 +229,22 @@ class Cell:
         self.texture = texture
     
     def __deepcopy__(self, _):
-        return Cell(*[deepcopy(a) for a in [
-            self.center, self.polygon, self.is_slanted, self.index, self.color, self.texture
-        ]])
+        return self.fast_clone()
+
+    def fast_clone(self):
+        '''
+        An independent copy of this cell. Much cheaper than a generic
+        deepcopy: the arrays are copied directly and the scalar fields
+        don't need copying at all.
+        '''
+        return Cell(
+            self.center.copy(),
+            self.polygon.copy(),
+            self.is_slanted,
+            self.index,
+            self.color,
+            dict(self.texture) if self.texture else None,
+        )
     
     def __repr__(self):
         return 'Cell(center={!r}, polygon={!r})'.format(self.center, self.polygon)
@@ -180,34 +256,39 @@ def voronoi_polygons(grid):
     
     Returns:
         cell (list[Cell]): the cells of the graph. A cell has a `center` and a\
-            `polygon` list of vertices. An example can be seen below:
-    
+            `polygon` (n, 3) vertex array. An example can be seen below:
+
     >>> g = grid((3, 3), scale=2.5)
-    >>> voronoi_polygons(g)
-    [Cell(center=Point3d(2.5, 2.5, 0), polygon=[Point3d(3.75, 1.25, 0), Point3d(3.75, 3.75, 0), Point3d(1.25, 3.75, 0), Point3d(1.25, 1.25, 0)])]
+    >>> cells = voronoi_polygons(g)
+    >>> cells[0].center
+    array([2.5, 2.5, 0. ])
+    >>> cells[0].polygon
+    array([[3.75, 1.25, 0.  ],
+           [3.75, 3.75, 0.  ],
+           [1.25, 3.75, 0.  ],
+           [1.25, 1.25, 0.  ]], dtype=float32)
     '''
     pyvoronoi_scaling = 100.0
     voro = pv.Pyvoronoi(pyvoronoi_scaling)
     for p in grid:
-        voro.AddPoint(p.xy)
+        voro.AddPoint([p[0], p[1]])
     voro.Construct()
     pv_cells = voro.GetCells()
-    
+
+    # materialize all vertices once, so the per-cell loop only gathers
+    # index arrays instead of allocating a point object per vertex
+    verts = np.array([[v.X, v.Y] for v in voro.GetVertices()])
     cells = []
-    for i, pv_cell in enumerate(pv_cells):
+    for pv_cell in pv_cells:
         if pv_cell.is_open:
             continue
-        polygon = []
-        for edge_index in pv_cell.edges:
-            e = voro.GetEdge(edge_index)
-            start = voro.GetVertex(e.start)
-            polygon.append(Point3d(
-                start.X,
-                start.Y,
-                grid[pv_cell.site].z
-            ))
+        site = grid[pv_cell.site]
+        starts = [voro.GetEdge(edge_index).start for edge_index in pv_cell.edges]
+        polygon = np.empty((len(starts), 3), dtype=np.float32)
+        polygon[:, :2] = verts[starts]
+        polygon[:, 2] = site[2]
         cells.append(Cell(
-            Point3d(*grid[pv_cell.site]),
+            site.copy(),
             polygon,
         ))
     return cells
@@ -232,8 +313,15 @@ def offset(cells, distance, join_type=JOIN_MITER):
                 too large to handle.
 
     '''
+    # the process-level offsetter is reused for the whole cell list;
+    # Clipper's solution order isn't tied to input order, so cells are
+    # still offset one by one rather than through a single AddPaths/Execute
+    clipper = _OFFSETTER
+    clipper.Clear()
+    scaled_distance = clip.scale_to_clipper(distance)
     for cell in cells:
-        cell.polygon = offset_polygon(cell.polygon, distance, join_type)
+        cell.polygon = _offset_polygon(clipper, cell.polygon, scaled_distance, join_type)
+        clipper.Clear()
 
 
 def offset_polygon(polygon, distance, join_type=JOIN_MITER):
@@ -243,22 +331,97 @@ def offset_polygon(polygon, distance, join_type=JOIN_MITER):
     
     See :py:func:`offset` for details.
     
-    >>> offset_polygon([Point3d(0,0,0), Point3d(2,0,0), Point3d(2,2,0), Point3d(0,2,0), Point3d(0,0,0)], 0.5)
-    [Point3d(2.5, 2.5, 0), Point3d(-0.5, 2.5, 0), Point3d(-0.5, -0.5, 0), Point3d(2.5, -0.5, 0), Point3d(2.5, 2.5, 0)]
-    
+    >>> square = np.array([[0,0,0], [2,0,0], [2,2,0], [0,2,0], [0,0,0]], dtype=float)
+    >>> offset_polygon(square, 0.5)
+    array([[ 2.5,  2.5,  0. ],
+           [-0.5,  2.5,  0. ],
+           [-0.5, -0.5,  0. ],
+           [ 2.5, -0.5,  0. ],
+           [ 2.5,  2.5,  0. ]], dtype=float32)
+
     Note: The point order is not stable!
-    
-    >>> offset_polygon([Point3d(0,0,0), Point3d(2,0,0), Point3d(2,2,0), Point3d(0,2,0), Point3d(0,0,0)], -0.5)
-    [Point3d(1.5, 1.5, 0), Point3d(0.5, 1.5, 0), Point3d(0.5, 0.5, 0), Point3d(1.5, 0.5, 0), Point3d(1.5, 1.5, 0)]
+
+    >>> offset_polygon(square, -0.5)
+    array([[1.5, 1.5, 0. ],
+           [0.5, 1.5, 0. ],
+           [0.5, 0.5, 0. ],
+           [1.5, 0.5, 0. ],
+           [1.5, 1.5, 0. ]], dtype=float32)
     '''
-    poly2d = [p.xy for p in polygon]
-    clipper = clip.PyclipperOffset()
+    _OFFSETTER.Clear()
+    return _offset_polygon(_OFFSETTER, polygon, clip.scale_to_clipper(distance), join_type)
+
+
+def _offset_polygon(clipper, polygon, scaled_distance, join_type=JOIN_MITER):
+    '''
+    Offset `polygon` using the given (cleared) `clipper` offsetter, by a
+    distance already scaled to clipper units. Loop-invariant for offset(),
+    so the distance is scaled once there.
+    '''
+    if len(polygon) == 0:
+        return polygon
+    poly2d = np.asarray(polygon)[:, :2].tolist()
     clipper.AddPath(clip.scale_to_clipper(poly2d), join_type, clip.ET_CLOSEDPOLYGON)
-    solution = clip.scale_from_clipper(clipper.Execute(clip.scale_to_clipper(distance)))
-    try:
-        return [Point3d(*p) for p in solution[0]] + [Point3d(*solution[0][0])]
-    except IndexError:
-        return []
+    solution = clip.scale_from_clipper(clipper.Execute(scaled_distance))
+    if not solution:
+        return np.empty((0, 3), dtype=np.float32)
+    return _ring_to_polygon(solution[0])
+
+
+def _ring_to_polygon(ring):
+    '''Close a 2D Clipper solution ring into an (n+1, 3) polygon with z=0.'''
+    polygon = np.zeros((len(ring) + 1, 3), dtype=np.float32)
+    polygon[:-1, :2] = ring
+    polygon[-1, :2] = ring[0]
+    return polygon
+
+
+def offset_two_stage(cells, distance1, distance2, join_type2=JOIN_SQUARE):
+    '''
+    Offset all `cells` by `distance1` and then by `distance2`, with
+    `join_type2` applied in the second stage.
+
+    Equivalent to two successive :py:func:`offset` calls, but the
+    intermediate polygon stays in Clipper's integer coordinates, saving one
+    scale round-trip through Python floats per cell.
+    '''
+    for cell in cells:
+        cell.polygon = offset_polygon_two_stage(cell.polygon, distance1, distance2, join_type2)
+
+
+def offset_polygon_two_stage(polygon, distance1, distance2, join_type2=JOIN_SQUARE):
+    '''
+    Offset a `polygon` by `distance1` units (mitered) and the result by
+    `distance2` units with `join_type2`, in one pass.
+
+    See :py:func:`offset_two_stage` for details.
+
+    >>> square = np.array([[0,0,0], [2,0,0], [2,2,0], [0,2,0], [0,0,0]], dtype=float)
+    >>> offset_polygon_two_stage(square, -0.75, 0.25, JOIN_SQUARE)
+    array([[1.5      , 0.6464466, 0.       ],
+           [1.5      , 1.3535534, 0.       ],
+           [1.3535534, 1.5      , 0.       ],
+           [0.6464466, 1.5      , 0.       ],
+           [0.5      , 1.3535534, 0.       ],
+           [0.5      , 0.6464466, 0.       ],
+           [0.6464466, 0.5      , 0.       ],
+           [1.3535534, 0.5      , 0.       ],
+           [1.5      , 0.6464466, 0.       ]], dtype=float32)
+    '''
+    if len(polygon) == 0:
+        return polygon
+    poly2d = np.asarray(polygon)[:, :2].tolist()
+    clipper = clip.PyclipperOffset()
+    clipper.AddPath(clip.scale_to_clipper(poly2d), JOIN_MITER, clip.ET_CLOSEDPOLYGON)
+    intermediate = clipper.Execute(clip.scale_to_clipper(distance1))
+    if not intermediate:
+        return np.empty((0, 3), dtype=np.float32)
+    clipper = clip.PyclipperOffset()
+    clipper.AddPaths(intermediate, join_type2, clip.ET_CLOSEDPOLYGON)
+    solution = clip.scale_from_clipper(clipper.Execute(clip.scale_to_clipper(distance2)))
+    if not solution:
+        return np.empty((0, 3), dtype=np.float32)
+    return _ring_to_polygon(solution[0])
 
 
 def slant_random(cells, max_slant, max_z_displace=0, seed=None):
@@ -273,11 +436,13 @@ def slant_random(cells, max_slant, max_z_displace=0, seed=None):
     >>> cells = voronoi_polygons(grid((3,3)))
     >>> slant_random(cells, 0.1, 0.1)
     '''
-    random.seed(seed)
-    for cell in cells:
-        slant_direction = random.random() * 2 * m.pi
-        slant_amount = random.random() * max_slant
-        z_displace = random.random() * max_z_displace
+    rng = _rng_for(seed)
+    # one RNG fill for all cells instead of three draws per cell
+    randoms = rng.random((len(cells), 3))
+    for cell, (r_direction, r_slant, r_z) in zip(cells, randoms):
+        slant_direction = r_direction * 2 * m.pi
+        slant_amount = r_slant * max_slant
+        z_displace = r_z * max_z_displace
         cell.polygon = slant_polygon(
             cell.polygon,
             cell.center,
@@ -297,8 +462,8 @@ def slant_polygon(polygon, center, direction, slant, z_displace):
     in positive z-direction to compensate.
     
     Args:
-        polygon (list[(float, float, float)]): A float polygon in 3D.
-        center ((float, float, float)): Center point around which to shear.
+        polygon (np.ndarray): An (n, 3) float polygon in 3D.
+        center (np.ndarray): x,y,z center point around which to shear.
         direction (float): Angle in radians, counter-clockwise from the
             positive x-axis, with the vertices along the direction receiving
             the greatest positive offset, the ones opposite the direction
@@ -308,22 +473,15 @@ def slant_polygon(polygon, center, direction, slant, z_displace):
         z_displace (float): An additional z-offset to add to all points in the
             polygon.
     '''
-    slanted = []
-    min_z = Point3d(0, 0, 1e9)  # larger than any sensible z-location
-    for point in polygon:
-        distance = point.xy - center.xy
-        slant_dir = Point2d(m.cos(direction), m.sin(direction)) * slant
-        slant_offset = distance.x * slant_dir.x + distance.y * slant_dir.y
-        slanted_point = point + Point3d(z=round(slant_offset))
-        if min_z.z > slanted_point.z:
-            min_z = slanted_point
-        slanted.append(slanted_point)
-    slant_compensation = -min_z.z if min_z.z < 0 else 0
-    displaced = []
-    for point in slanted:
-        displaced_point = point + Point3d(z=round(z_displace + slant_compensation))
-        displaced.append(displaced_point)
-    return displaced
+    # keep the polygon's (float32) dtype instead of widening to float64
+    slanted = np.array(polygon)
+    slant_vec = np.array([m.cos(direction), m.sin(direction)]) * slant
+    # the whole shear is one dot product over the vertex rows
+    slanted[:, 2] += np.rint((slanted[:, :2] - center[:2]) @ slant_vec)
+    min_z = slanted[:, 2].min() if len(slanted) else 0
+    slant_compensation = -min_z if min_z < 0 else 0
+    slanted[:, 2] += round(z_displace + slant_compensation)
+    return slanted
 
 
 def remove_random_cells(cells, count, grid_size, wrap_amount, scale=1.0, seed=None):
@@ -339,32 +497,34 @@ def remove_random_cells(cells, count, grid_size, wrap_amount, scale=1.0, seed=No
         scale (float): The internal scaling factor.
     '''
     inverted_cells = []
-    random.seed(seed)
-    for i in range(count):
-        cell_indices = range(len(cells))
-        rindex = random.choice(cell_indices)
-        tries = 1000
-        while not _cell_visible(cells[rindex], grid_size, wrap_amount, scale) and tries > 0:
-            rindex = random.choice(cell_indices)
-            tries -= 1
-        if tries <= 0:
-            rindex = len(cells) // 2
-        cell = cells[rindex]
-        mirror_cells = [cell] + _get_wrapped_cells(cells, cell, grid_size, scale)
-        icells = deepcopy(mirror_cells)
-        
-        for c in mirror_cells:
-            cells.remove(c)
-        
+    rng = _rng_for(seed)
+    # removals are collected in a set and applied in one rebuild at the
+    # end; list.remove inside the loop would rescan the list per mirror
+    removed = set()
+    centers = _cell_centers(cells)
+    # check all cells against the visible bounds at once and draw the
+    # victims from that index, instead of rejection-sampling cell by cell
+    low = wrap_amount // 2 * scale
+    high = (np.array(grid_size) + wrap_amount // 2) * scale
+    vis_idx = np.flatnonzero(((centers >= low) & (centers <= high)).all(axis=1))
+    if len(vis_idx):
+        picks = rng.choice(vis_idx, size=min(count, len(vis_idx)), replace=False)
+    else:
+        picks = [len(cells) // 2] * count
+    for rindex in picks:
+        cell = cells[int(rindex)]
+        mirror_cells = [cell] + _get_wrapped_cells(cells, cell, grid_size, scale, centers)
+        icells = [c.fast_clone() for c in mirror_cells]
+        removed.update(id(c) for c in mirror_cells)
         for c in icells:
-            c.center.z = 0
-            for p in c.polygon:
-                p.z = 0
+            c.center[2] = 0
+            c.polygon[:, 2] = 0
         inverted_cells += icells
+    cells[:] = [c for c in cells if id(c) not in removed]
     return inverted_cells
 
 
-def apply_random_texture(cells, texture_images, grid_size, scale=1.0):
+def apply_random_texture(cells, texture_images, grid_size, scale=1.0, seed=None):
     '''
     Set a random texture image with random rotation for each cell.
     
@@ -375,52 +535,63 @@ def apply_random_texture(cells, texture_images, grid_size, scale=1.0):
         scale (float): The internal scaling factor.
     '''
     if texture_images:
-        cells = deepcopy(cells)
-        for cell in cells:
-            texture = random.choice(texture_images)
-            mirror_cells = [cell] + _get_wrapped_cells(cells, cell, grid_size, scale)
-            for c in mirror_cells:
-                c.texture = {
-                    'file': path.abspath(texture),
-                    'transform': 'rotate({}, 50%, 50%)'.format(random.randint(0,359))
-                }
+        cells = [c.fast_clone() for c in cells]
+        # normalize every texture path and read its size once up front, so
+        # the per-cell loop only indexes precomputed lists
+        abs_paths = [path.abspath(image_file) for image_file in texture_images]
+        texture_sizes = []
+        for image_file in texture_images:
+            with Image.open(image_file) as img:
+                texture_sizes.append(img.size)
+        rng = _rng_for(seed)
+        picks = rng.integers(0, len(texture_images), size=len(cells))
+        rotations = rng.integers(0, 360, size=len(cells))
+        centers = _cell_centers(cells)
+        for i, cell in enumerate(cells):
+            pick = picks[i]
+            texture = {
+                'file': abs_paths[pick],
+                'transform': 'rotate({}, 50%, 50%)'.format(rotations[i]),
+                'size': texture_sizes[pick],
+            }
+            # mirror cells share the texture dict, so wrapped copies tile
+            # with the same image and rotation
+            for c in [cell] + _get_wrapped_cells(cells, cell, grid_size, scale, centers):
+                c.texture = texture
         return cells
     return None
 
 
-def _cell_visible(cell, grid_size, wrap_amount, scale=1.0):
-    '''.. TODO(jakob):: Document me!'''
-    x_visible = (wrap_amount//2 * scale) <= cell.center.x <= ((grid_size[0] + wrap_amount//2) * scale)
-    y_visible = (wrap_amount//2 * scale) <= cell.center.y <= ((grid_size[1] + wrap_amount//2) * scale)
-    return x_visible and y_visible
+def _cell_centers(cells):
+    '''The cells' center x,y coordinates as an (N, 2) array.'''
+    return np.array([c.center[:2] for c in cells])
 
 
-def _get_wrapped_cells(cells, cell, grid_size, scale=1.0):
+def _get_wrapped_cells(cells, cell, grid_size, scale=1.0, centers=None):
     '''
     Returns:
         Cells which are the wrapped counterpart of the given `cell`.
-    
+
+    Callers querying many cells against the same list should precompute
+    `centers` once with :py:func:`_cell_centers` and pass it in.
+
     >>> g = grid((4,4))
     >>> g = wrap(g, (4,4), 4)
     >>> cells = voronoi_polygons(g)
     >>> len(_get_wrapped_cells(cells, cells[6], (4,4)))
     3
     '''
-    wrapped_cells = []
+    if centers is None:
+        centers = _cell_centers(cells)
     epsilon = 0.1
-    cc = cell.center
-    for test_cell in cells:
-        tc = test_cell.center
-        same = abs(tc - cc)
-        plus_gridsize = abs(tc - (cc + (Point2d(*grid_size) * scale)))
-        minus_gridsize = abs(tc - (cc - (Point2d(*grid_size) * scale)))
-        if ((plus_gridsize.x  < epsilon and same.y           < epsilon) or
-            (minus_gridsize.x < epsilon and same.y           < epsilon) or
-            (plus_gridsize.y  < epsilon and same.x           < epsilon) or
-            (minus_gridsize.y < epsilon and same.x           < epsilon) or
-            (plus_gridsize.x  < epsilon and plus_gridsize.y  < epsilon) or
-            (plus_gridsize.x  < epsilon and minus_gridsize.y < epsilon) or
-            (minus_gridsize.x < epsilon and plus_gridsize.y  < epsilon) or
-            (minus_gridsize.x < epsilon and minus_gridsize.y < epsilon)):
-            wrapped_cells.append(test_cell)
-    return wrapped_cells
+    gx = grid_size[0] * scale
+    gy = grid_size[1] * scale
+    # a cell is a wrapped counterpart if it lies within epsilon (per axis)
+    # of one of the eight grid-shifted copies of the queried center
+    shifts = np.array([
+        [gx, 0], [-gx, 0], [0, gy], [0, -gy],
+        [gx, gy], [gx, -gy], [-gx, gy], [-gx, -gy],
+    ])
+    targets = cell.center[:2] + shifts
+    near = (np.abs(centers[None, :, :] - targets[:, None, :]) < epsilon).all(axis=2)
+    return [cells[i] for i in np.flatnonzero(near.any(axis=0))]
@@ -4,6 +4,7 @@
 import sys
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from sys import platform
 try:
     from subprocess import run
@@ -61,6 +62,7 @@ def cli(*argv):
     # parser.add_argument('-t', '--type',        default='depth',         choices=['depth', 'displacement'],           help='depth data type')
     parser.add_argument('-g', '--ground-type', default='asphalt',       choices=['cobblestone', 'asphalt', 'slate'], help='ground style')
     parser.add_argument('-d', '--defects',     default=0,               type=uint,                                   help='number of road defects')
+    parser.add_argument('-s', '--start-index', default=0,               type=uint,                                   help='index of the first output image (used by util/batch.py to run several generators in parallel)')
     parser.add_argument('-D', '--depth-range', default='16bit',         choices=['8bit', '16bit'],                   help='depth output pixel bit depth')
     
     # Camera options
@@ -103,20 +105,31 @@ def cli(*argv):
     command = [args.blenderpath] + blender_options + ['--python', os.path.join(args.project, 'main.py')]
     if args.verbose > 0:
         print(command)
+    # the textures for the next image are generated into a staging
+    # directory while blender renders the current one, and swapped into
+    # blender's input directory between the two runs
+    staging = os.path.join(args.output, '.staging')
     try:
-        for  i in range(args.number):
-            if args.verbose == 0 and not args.quiet:
-                progress_bar(i, args.number, style=PROGRESS_VERTICAL)
-            write_config(args, config_keys, args.project, image_index=i)
-            if args.verbose > 0:
-                print('generating ground textures')
-                ground_textures(args.output, args.ground_type, args.defects)
-                run(command)
-            else:
-                ground_textures(args.output, args.ground_type, args.defects)
-                progress_bar(i+0.15, args.number, style=PROGRESS_VERTICAL)
-                with OutputSuppressor():
+        with ThreadPoolExecutor(max_workers=1) as texture_pool:
+            textures_ready = texture_pool.submit(
+                ground_textures, staging, args.ground_type, args.defects)
+            for i in range(args.number):
+                if args.verbose == 0 and not args.quiet:
+                    progress_bar(i, args.number, style=PROGRESS_VERTICAL)
+                write_config(args, config_keys, args.project, image_index=args.start_index + i)
+                if args.verbose > 0:
+                    print('generating ground textures')
+                textures_ready.result()
+                _publish_textures(staging, args.output)
+                if i + 1 < args.number:
+                    textures_ready = texture_pool.submit(
+                        ground_textures, staging, args.ground_type, args.defects)
+                if args.verbose > 0:
                     run(command)
+                else:
+                    progress_bar(i+0.15, args.number, style=PROGRESS_VERTICAL)
+                    with OutputSuppressor():
+                        run(command)
         if args.verbose == 0 and not args.quiet:
             progress_bar(args.number, args.number, style=PROGRESS_VERTICAL)
             print()
@@ -134,6 +147,19 @@ def cli(*argv):
     # remove_config()
 
 
+def _publish_textures(staging_output, output):
+    '''
+    Move freshly staged texture images into the directory blender reads.
+    Staging keeps the texture generation for the next image from clobbering
+    the files a still-running blender might read for the current one.
+    '''
+    source = os.path.join(staging_output, 'road_textures')
+    destination = os.path.join(output, 'road_textures')
+    os.makedirs(destination, exist_ok=True)
+    for name in os.listdir(source):
+        os.replace(os.path.join(source, name), os.path.join(destination, name))
+
+
 def ground_textures(output, ground_type, defects=0):
     texture_output = os.path.join(output, 'road_textures')
     if ground_type == 'cobblestone':
@@ -1,28 +1,11 @@
 import os
 import sys
 import bpy
-import math
 
 # To be able to find this project's modules, the path needs to be added to
 # sys.path.
 basepath = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
 sys.path.append(basepath)
-from util.config import read_config
-from blender.model import load_new_model
-from blender.scenes import (
-    set_resolution,
-    set_depth_pixel_depth,
-    link_new_scene,
-    clear_scenes,
-    delete_objects,
-    ground_visibility,
-    correct_object_names,
-)
-from blender.cameras import position_cameras, dump_k_matrix, setup_displacement_values
-from blender.lighting import set_lighting
-from grounds.meshes import cobblestone_ground, slate_ground, asphalt_ground
-from grounds.meshes import always_defects
-from util.output_suppressor import OutputSuppressor
 
 
 
@@ -46,6 +29,25 @@ def main():
     
         $ blender --python main.py [ -- config file]
     '''
+    # deferred so that each short-lived blender subprocess only walks the
+    # project import graph once an actual render run is underway
+    from util.config import read_config
+    from blender.model import load_new_model
+    from blender.scenes import (
+        set_resolution,
+        set_depth_pixel_depth,
+        link_new_scene,
+        clear_scenes,
+        delete_objects,
+        ground_visibility,
+        correct_object_names,
+    )
+    from blender.cameras import position_cameras, dump_k_matrix, setup_displacement_values
+    from blender.lighting import set_lighting
+    from grounds.meshes import cobblestone_ground, slate_ground, asphalt_ground
+    from grounds.meshes import always_defects
+    from util.output_suppressor import OutputSuppressor
+
     global VERBOSITY
     basepath = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(sys.argv[3])))
     try:
@@ -114,19 +116,26 @@ def main():
         v('defects scene set up')
     
     correct_object_names()
-    
+
+    # the single render call below already drives every scene through the
+    # main compositor; make that explicit and skip the sequencer pass,
+    # which has nothing to contribute here
+    main_scene.render.use_compositing = True
+    for scene in bpy.data.scenes:
+        scene.render.use_sequencer = False
+
     if config['defects'] or always_defects:
         ground_visibility(main_scene, ground_visible=True, defects_visible=False)
         ground_visibility(right_scene, ground_visible=True, defects_visible=False)
         ground_visibility(defects_scene, ground_visible=False, defects_visible=True)
     
     set_depth_pixel_depth(nodes, config['depth_range'])
-    # set filenames for left, depth, right & disparity pictures
-    nodes['File Output'].file_slots[0].path = os.path.join(output_path, '{}-{:0>5}-#-left.png'.format(config['ground_type'], config['image_index']))
-    nodes['File Output'].file_slots[1].path = os.path.join(output_path, '{}-{:0>5}-#-right.png'.format(config['ground_type'], config['image_index']))
-    nodes['File Output'].file_slots[2].path = os.path.join(output_path, '{}-{:0>5}-#-depth.png'.format(config['ground_type'], config['image_index']))
-    nodes['File Output'].file_slots[3].path = os.path.join(output_path, '{}-{:0>5}-#-displacement.png'.format(config['ground_type'], config['image_index']))
-    nodes['File Output'].file_slots[4].path = os.path.join(output_path, '{}-{:0>5}-#-defects.png'.format(config['ground_type'], config['image_index']))
+    # set filenames for left, depth, right & disparity pictures; the node
+    # lookup and the common path prefix are resolved once, not per slot
+    file_slots = nodes['File Output'].file_slots
+    prefix = os.path.join(output_path, '{}-{:0>5}-#'.format(config['ground_type'], config['image_index']))
+    for slot, name in enumerate(('left', 'right', 'depth', 'displacement', 'defects')):
+        file_slots[slot].path = '{}-{}.png'.format(prefix, name)
     
     factor = setup_displacement_values(nodes, cameras, 0.04)
     
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Run several image generators in parallel, each rendering a disjoint slice
+of the requested image indices.
+
+Every worker is a full ``image_generator.py`` process with its own output
+directory (``<output>/worker0``, ``worker1``, ...), so the texture inputs
+of concurrent blender runs cannot clobber each other; image indices are
+globally unique across workers, so the rendered sets can simply be merged
+afterwards. Workers read their configuration from the environment (see
+``util/config.py``), which keeps the shared on-disk ``config.json`` out of
+the hot path.
+
+Example, 100 image sets on 4 processes::
+
+    $ python util/batch.py -n 100 -j 4 -g cobblestone
+'''
+import argparse
+import os
+import subprocess
+import sys
+
+
+def cli(*argv):
+    parser = argparse.ArgumentParser(
+        description='run image_generator.py in parallel worker processes',
+        epilog='all other options are passed through to image_generator.py',
+    )
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of parallel generator processes')
+    parser.add_argument('-n', '--number', type=int, required=True,
+                        help='total number of output images over all workers')
+    parser.add_argument('-o', '--output', default='output',
+                        help='output path, workers write to per-worker subdirectories')
+    args, passthrough = parser.parse_known_args(argv[1:])
+    generator = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        'image_generator.py',
+    )
+    jobs = max(1, min(args.jobs or 1, args.number))
+    per_worker, remainder = divmod(args.number, jobs)
+    workers = []
+    start = 0
+    for k in range(jobs):
+        count = per_worker + (1 if k < remainder else 0)
+        if count == 0:
+            continue
+        workers.append(subprocess.Popen([
+            sys.executable, generator,
+            '-n', str(count),
+            '--start-index', str(start),
+            '-o', os.path.join(args.output, 'worker{}'.format(k)),
+            '-q',
+        ] + passthrough))
+        start += count
+    returncode = 0
+    for worker in workers:
+        returncode = worker.wait() or returncode
+    return returncode
+
+
+if __name__ == '__main__':
+    sys.exit(cli(*sys.argv))
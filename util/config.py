@@ -1,9 +1,11 @@
 '''
 Config file for passing options from the CLI to the blender project subprocess.
+The config also travels encoded in the environment, so a subprocess spawned
+after :py:meth:`write_config` can read it without touching the disk.
 
->>> write_config('.', {'one': 1, 'two': 2, 'three': 3}, ['one', 'three'], four=4)
+>>> write_config({'one': 1, 'two': 2, 'three': 3}, ['one', 'three'], '.', four=4)
 >>> read_config('.')
-{'four': 4, 'one': 1, 'three': 3}
+{'one': 1, 'three': 3, 'four': 4}
 >>> remove_config()
 
 The config object returned by :py:meth:`read_config` is a special `dict` subclass
@@ -13,14 +15,20 @@ that returns `None` on missing keys:
 >>> print(c['other'])
 None
 '''
+import base64
 import os
 import os.path
 # import yaml  # Change this and the relevant lines below to use YAML instead.
 import json
+try:  # parses raw bytes and skips the text decode, if it's available
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # config_filename = 'config.yml'
 config_filename = 'config.json'
+config_env_var = 'ROADGEN_CONFIG'
 
 
 def write_config(options, keys, output_path='.', file=config_filename, **extra_keys):
@@ -38,6 +46,10 @@ def write_config(options, keys, output_path='.', file=config_filename, **extra_k
     for key, value in extra_keys.items():
         kye = key.replace('-', '_')
         config[key] = value
+    # the encoded copy is inherited by subprocesses through the
+    # environment, so their read_config skips the file read and parse;
+    # the file stays as fallback and for inspection
+    os.environ[config_env_var] = base64.b64encode(json.dumps(config).encode()).decode()
     with open(os.path.join(output_path, file), 'w') as config_file:
         # yaml.safe_dump(config, config_file, default_flow_style=False)
         json.dump(config, config_file, indent=4)
@@ -53,14 +65,23 @@ def read_config(output_path='.', file=config_filename):
             configuration values.
         
     '''
+    if file == config_filename:  # an explicitly given file wins over the environment
+        encoded = os.environ.get(config_env_var)
+        if encoded:
+            try:
+                return Config(json.loads(base64.b64decode(encoded)))
+            except ValueError:
+                pass  # corrupt environment entry, fall back to the file
     config = {}
     try:
-        with open(os.path.join(output_path, file)) as config_file:
-            # config = yaml.safe_load(config_file)
-            try:
-                config = json.load(config_file)
-            except Exception:
-                raise ValueError('Invalid JSON in config.')
+        # read the raw bytes in one go; both parsers take them directly
+        with open(os.path.join(output_path, file), 'rb') as config_file:
+            raw = config_file.read()
+        # config = yaml.safe_load(raw)
+        try:
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            raise ValueError('Invalid JSON in config.')
     except FileNotFoundError:
         print('Warning: No config file found ({}).'.format(os.path.join(output_path, file)))
     return Config(config)
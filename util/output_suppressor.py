@@ -24,27 +24,51 @@ there should be something after this -> <- there should be something before this
 Adapted from
 https://stackoverflow.com/questions/11130156/suppress-stdout-stderr-print-from-python-functions
 '''
+import atexit
 import os
 
 
+# one devnull file descriptor shared by all suppressors; it is opened on
+# first use and stays open until interpreter exit, so entering a
+# suppressor costs only the mandatory dup/dup2 pair per channel
+_null_fd = None
+
+def _get_null_fd():
+    global _null_fd
+    if _null_fd is None:
+        _null_fd = os.open(os.devnull, os.O_RDWR)
+        atexit.register(_close_null_fd)
+    return _null_fd
+
+def _close_null_fd():
+    global _null_fd
+    if _null_fd is not None:
+        os.close(_null_fd)
+        _null_fd = None
+
+
 class Suppressor(object):
     '''Only show ouput written to specific channels. Suppress all other output.'''
     def __init__(self, suppress_stdout=True, suppress_stderr=True):
         self.suppress = {1: bool(suppress_stdout), 2: bool(suppress_stderr)}
-        # Open a pair of null files
-        self.null_fds = {k: os.open(os.devnull, os.O_RDWR) for k, s in self.suppress.items() if s}
-        # Save the actual stdout (1) and stderr (2) file descriptors.
-        self.save_fds = {k: os.dup(k) for k, s in self.suppress.items() if s}
-    
+        # the channels to redirect, filtered once instead of per enter/exit
+        self._active = tuple(k for k, s in self.suppress.items() if s)
+        self.save_fds = {}
+
     def __enter__(self):
-        # Assign the null pointers to stdout and stderr.
-        [os.dup2(self.null_fds[k], k) for k, s in self.suppress.items() if s]
-    
+        null_fd = _get_null_fd()
+        # Save the actual stdout (1) and stderr (2) file descriptors,
+        # then point both at the shared null fd.
+        for k in self._active:
+            self.save_fds[k] = os.dup(k)
+            os.dup2(null_fd, k)
+
     def __exit__(self, *args):
         # Re-assign the real stdout/stderr back to (1) and (2)
-        [os.dup2(self.save_fds[k], k) for k, s in self.suppress.items() if s]
-        # Close the null files
-        [os.close(fd) for fd in self.null_fds.values()]
+        for k in self._active:
+            os.dup2(self.save_fds[k], k)
+            os.close(self.save_fds[k])
+        self.save_fds = {}
 
 
 class ErrorSuppressor(Suppressor):
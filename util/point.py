@@ -72,107 +72,153 @@ ValueError: color value cannot be negative: -200
     https://en.wikipedia.org/wiki/Swizzling_(computer_graphics)
 '''
 import math
-import itertools
-from copy import deepcopy
+
+import numpy as np
+
+
+# everything the operators treat as a vector of components; anything else
+# is broadcast as a scalar
+_VECTOR_TYPES = (tuple, list, np.ndarray)
 
 
 class BasePoint:
-    components = []
-    coercion = None
+    components = ()
+    _dtype = np.float64
+    # allowed swizzle lengths and the class each resolves to; filled in
+    # after the concrete classes below are defined
+    _swizzle_classes = {}
+    _index_map = {}
+    _n = 0
+    def __init_subclass__(cls, **kwargs):
+        # freeze the component list and precompute the name-to-index
+        # mapping, so component access never scans the sequence
+        super().__init_subclass__(**kwargs)
+        cls.components = tuple(cls.components)
+        cls._index_map = {c: i for i, c in enumerate(cls.components)}
+        cls._n = len(cls.components)
     def __init__(self, *args, **kwargs):
         args = list(args)
-        for c in self.components:
-            if type(self).coercion is not None:
-                setattr(self, c, type(self).coercion(kwargs[c] if c in kwargs else (args.pop(0) if len(args) > 0 else 0)))
-            else:
-                setattr(self, c, kwargs[c] if c in kwargs else (args.pop(0) if len(args) > 0 else 0))
+        values = [
+            kwargs[c] if c in kwargs else (args.pop(0) if len(args) > 0 else 0)
+            for c in self.components
+        ]
+        # the components live in one small float array, so the operators
+        # below are single ufunc calls instead of per-component loops
+        self._v = np.asarray(values, dtype=self._dtype)
+        self._validate(self._v)
+    @classmethod
+    def _from_array(cls, values):
+        '''Build a point directly from a component array, skipping __init__.'''
+        point = object.__new__(cls)
+        point._v = np.asarray(values, dtype=cls._dtype)
+        cls._validate(point._v)
+        return point
+    @classmethod
+    def _validate(cls, values):
+        '''Value check hook, overridden by the color classes.'''
+    def _binary(self, op, other):
+        # type checks instead of a try/except around len(other): catching
+        # a TypeError per operator call costs more than both branches here
+        if isinstance(other, BasePoint):
+            other = other._v
+        elif isinstance(other, _VECTOR_TYPES):
+            other = np.asarray(other, dtype=self._dtype)
+        else:  # a scalar, broadcast over all components
+            return self._from_array(op(self._v, other))
+        # as many components as `other` has, the rest default to 0
+        return type(self)(*op(self._v[:len(other)], other))
+    def _compare(self, op, other):
+        if isinstance(other, BasePoint):
+            other = other._v
+        elif isinstance(other, _VECTOR_TYPES):
+            other = np.asarray(other, dtype=self._dtype)
+        else:
+            return tuple(bool(b) for b in op(self._v, other))
+        return tuple(bool(b) for b in op(self._v[:len(other)], other))
     # indexed access
     def __getitem__(self, index):
-        if index in range(len(self.components)):
-            return getattr(self, self.components[index])
-        elif index in self.components:
-            return getattr(self, index)
-        else: raise IndexError('Point index out of range')
+        if isinstance(index, str):
+            if index in self._index_map:
+                return _number(self._v[self._index_map[index]])
+        elif 0 <= index < self._n:
+            return _number(self._v[index])
+        raise IndexError('Point index out of range')
+    def __getattr__(self, name):
+        # only reached for names that aren't plain attributes: the
+        # component names themselves and swizzle permutations
+        index = self._index_map.get(name)
+        if index is None:
+            return self._swizzle(name)
+        return _number(self._v[index])
+    def _swizzle(self, name):
+        '''
+        Resolve a swizzle like ``zy`` or ``wzxy`` on first use. The name is
+        parsed into component indices once per class and cached, so nothing
+        is materialized for the hundreds of permutations never asked for.
+        '''
+        cls = type(self)
+        cache = cls.__dict__.get('_swizzle_cache')
+        if cache is None:
+            cache = {}
+            setattr(cls, '_swizzle_cache', cache)
+        if name not in cache:
+            return_class = cls._swizzle_classes.get(len(name))
+            if return_class is None or not all(c in cls._index_map for c in name):
+                raise AttributeError(name)
+            cache[name] = (return_class, [cls._index_map[c] for c in name])
+        return_class, indices = cache[name]
+        return return_class._from_array(self._v[indices])
+    def __setattr__(self, name, value):
+        index = self._index_map.get(name)
+        if index is not None:
+            self._v[index] = value
+        else:
+            object.__setattr__(self, name, value)
     # arithmetic operators
-    def __add__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) + other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) + other for c in self.components])
-    def __sub__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) - other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) - other for c in self.components])
-    def __mul__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) * other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) * other for c in self.components])
-    def __truediv__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) / other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) / other for c in self.components])
-    def __floordiv__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) // other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) // other for c in self.components])
-    def __mod__(self, other):
-        try: return type(self)(*[getattr(self, self.components[i]) % other[i] for i in range(len(other))])
-        except TypeError: return type(self)(*[getattr(self, c) % other for c in self.components])
-    def __neg__(self): return type(self)(*[-(getattr(self, c)) for c in self.components])
+    def __add__(self, other): return self._binary(np.add, other)
+    def __sub__(self, other): return self._binary(np.subtract, other)
+    def __mul__(self, other): return self._binary(np.multiply, other)
+    def __truediv__(self, other): return self._binary(np.true_divide, other)
+    def __floordiv__(self, other): return self._binary(np.floor_divide, other)
+    def __mod__(self, other): return self._binary(np.mod, other)
+    def __neg__(self): return self._from_array(-self._v)
     def __pos__(self): return self
     # numerical properties
-    def __abs__(self): return type(self)(*[abs(getattr(self, c)) for c in self.components])
-    def __round__(self): return type(self)(*[round(getattr(self, c)) for c in self.components])
-    def __int__(self): return type(self)(*[int(getattr(self, c)) for c in self.components])
-    def __float__(self): return type(self)(*[float(getattr(self, c)) for c in self.components])
+    def __abs__(self): return self._from_array(np.abs(self._v))
+    def __round__(self): return self._from_array(np.round(self._v))
+    def __int__(self): return self._from_array(np.trunc(self._v))
+    def __float__(self): return self._from_array(self._v)
     # comparisons
-    def __gt__(self, other):
-        try: return tuple(getattr(self, self.components[i]) > other[i] for i in range(len(other)))
-        except TypeError: return tuple(getattr(self, c) > other for c in self.components)
-    def __lt__(self, other):
-        try: return tuple(getattr(self, self.components[i]) < other[i] for i in range(len(other)))
-        except TypeError: return tuple(getattr(self, c) < other for c in self.components)
-    def __ge__(self, other):
-        try: return tuple(getattr(self, self.components[i]) >= other[i] for i in range(len(other)))
-        except TypeError: return tuple(getattr(self, c) >= other for c in self.components)
-    def __le__(self, other):
-        try: return tuple(getattr(self, self.components[i]) <= other[i] for i in range(len(other)))
-        except TypeError: return tuple(getattr(self, c) <= other for c in self.components)
-    def __eq__(self, other):
-        try: return tuple(getattr(self, self.components[i]) == other[i] for i in range(len(other)))
-        except TypeError: return tuple(getattr(self, c) == other for c in self.components)
+    def __gt__(self, other): return self._compare(np.greater, other)
+    def __lt__(self, other): return self._compare(np.less, other)
+    def __ge__(self, other): return self._compare(np.greater_equal, other)
+    def __le__(self, other): return self._compare(np.less_equal, other)
+    def __eq__(self, other): return self._compare(np.equal, other)
     # container properties
-    def __len__(self): return len(self.components)
-    def __contains__(self, component): return component in self.components
+    def __len__(self): return self._n
+    def __contains__(self, component): return component in self._index_map
     def __iter__(self):
-        for c in self.components:
-            yield getattr(self, c)
+        for value in self._v:
+            yield _number(value)
     # object properties
-    def __deepcopy__(self, memo): return type(self)(*[getattr(self, c) for c in self.components])
-    def __str__(self): return '(' + ', '.join([str(getattr(self, c)) for c in self.components]) + ')'
+    def __deepcopy__(self, memo): return self._from_array(self._v.copy())
+    def __str__(self): return '(' + ', '.join([str(v) for v in self]) + ')'
     def __repr__(self):
-        return type(self).__name__ + '(' + ', '.join([
-            str(getattr(self, c)) for c in self.components
-            # '{}={}'.format(c, getattr(self, c)) for c in self.components
-        ]) + ')'
-    
+        return type(self).__name__ + '(' + ', '.join([str(v) for v in self]) + ')'
+
     # actual methods
     def distance(self, other):
         '''Calculate the euclidean distance from another point.'''
-        return math.sqrt(sum([(other[i] - getattr(self, c))**2 for i, c in enumerate(self.components)]))
+        if isinstance(other, BasePoint):
+            other = other._v
+        # for these tiny vectors `d @ d` hits the dot-product micro-kernel,
+        # skipping the general-purpose machinery of np.linalg.norm
+        d = np.asarray(other, dtype=self._dtype)[:self._n] - self._v
+        return math.sqrt(float(d @ d))
     def veclen(self):
         '''Calculate the euclidean distance from the origin.'''
-        return self.distance(type(self)())
+        return math.sqrt(float(self._v @ self._v))
     
-    @classmethod
-    def _make_swizzles(cls, partial_classes=[]):
-        '''Dynamically generate swizzles: xy, yx, xyz, yxz, xzy, and
-           so forth by creating class properties. '''
-        swizzle_classes = partial_classes + [cls]
-        perm_len_offset = max(0, len(cls.components) - len(partial_classes))
-        for i, swizzle_class in enumerate(swizzle_classes):
-            for c_order in itertools.product(cls.components, repeat=perm_len_offset + i):
-                setattr(cls, ''.join(c_order), property(cls._make_swizzle(swizzle_classes[i], c_order)))
-    @classmethod
-    def _make_swizzle(cls, return_class, components):
-        '''Swizzle factory. Needed because of python's late binding.'''
-        def swizzle(self):
-            return return_class(*[self[c] for c in deepcopy(components)])
-        return swizzle
 
 
 ### Numeric Points
@@ -189,58 +235,55 @@ def _number(value):
         return f
 
 class BaseNumericPoint(BasePoint):
-    coercion = _number
+    pass
 
 class Point2d(BaseNumericPoint):
     '''A point in two dimensions.'''
     components = ['x', 'y']
-Point2d._make_swizzles()
 
 class Point3d(BaseNumericPoint):
     '''A point in three dimensions.'''
     components = ['x', 'y', 'z']
-Point3d._make_swizzles([Point2d])
 
 class Point4d(BaseNumericPoint):
     '''A point in four dimensions. The fourth dimension is `w`.'''
     components = ['x', 'y', 'z', 'w']
-# At this point one _make_swizzles()-line creates 300 properties (or 336
-# without inheritance from Point3d)
-Point4d._make_swizzles([Point2d, Point3d])
+
+# swizzles resolve lazily on first attribute access (Point4d alone would
+# otherwise materialize 300 properties at import time)
+Point2d._swizzle_classes = {2: Point2d}
+Point3d._swizzle_classes = {2: Point2d, 3: Point3d}
+Point4d._swizzle_classes = {2: Point2d, 3: Point3d, 4: Point4d}
 
 
 class Point2dTex(BaseNumericPoint):
     '''Two-dimensional texture coordinates in `u` and `v`. '''
     components = ['u', 'v']
-Point2dTex._make_swizzles()
+Point2dTex._swizzle_classes = {2: Point2dTex}
 
 
 ### Colors
 
-def _color(value):
-    '''
-    Coerce components to a color value. Either a positive integer, or a float
-    between 0.0 and 1.0.
-    '''
-    f = float(value)
-    if f % 1.0 == 0:
-        if f >= 0:
-            return int(f)
-        else:
-            raise ValueError('color value cannot be negative: {}'.format(value))
-    elif 0 <= f <= 1:
-        return f
-    else:
-        raise ValueError('color value outside range (0, 1): {}'.format(value))
-
-
 class BaseColor(BasePoint):
-    coercion = _color
+    @classmethod
+    def _validate(cls, values):
+        '''
+        Check all components at once: a color value is either a positive
+        integer, or a float between 0.0 and 1.0.
+        '''
+        fractional = values % 1.0 != 0
+        bad = (values < 0) | (fractional & (values > 1))
+        if bad.any():
+            index = int(np.argmax(bad))
+            value = _number(values[index])
+            if fractional[index]:
+                raise ValueError('color value outside range (0, 1): {}'.format(value))
+            raise ValueError('color value cannot be negative: {}'.format(value))
 
 class ColorRgb(BaseColor):
     '''A color with `r`, `g` and `b` channels.'''
     components = ['r', 'g', 'b']
-ColorRgb._make_swizzles()
+ColorRgb._swizzle_classes = {3: ColorRgb}
 
 class ColorHsv(BaseColor):
     '''A color in HSV space.'''
@@ -249,11 +292,15 @@ class ColorHsv(BaseColor):
 class ColorHsl(BaseColor):
     '''A color in HSL space.'''
     components = ['h', 's', 'l']
+    # HSL <-> HLS is a pure channel reorder, so the conversion is a single
+    # gather with a permutation built once at class definition
+    _HLS_IDX = np.array([0, 2, 1])
     @property
-    def hls(self): return ColorHls(self.h, self.l, self.s)
+    def hls(self): return ColorHls._from_array(self._v[ColorHsl._HLS_IDX])
 
 class ColorHls(BaseColor):
     '''A color in HLS space with luminance and saturation exchanged.'''
     components = ['h', 'l', 's']
+    _HSL_IDX = np.array([0, 2, 1])
     @property
-    def hsl(self): return ColorHsl(self.h, self.s, self.l)
+    def hsl(self): return ColorHsl._from_array(self._v[ColorHls._HSL_IDX])
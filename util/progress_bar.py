@@ -20,23 +20,44 @@ Run ``python progress_bar.py`` in a terminal to see a demo.
 '''
 
 import os
-import math
+import signal
 import sys
 from collections import OrderedDict
 
 
+# meters are tuples of 1-char strings, so the hot path below only does
+# plain index operations
 METERS = OrderedDict([
-    [ 'smooth',   ' ▏▎▍▌▋▊▉█' ],
-    [ 'vertical', ' ▁▂▃▄▅▆▇█' ],
-    [ 'corners',  ' ▖▌▛█'     ],
-    [ 'shaded',   ' ░▒▓█'     ],
-    [ 'ascii',    ' .:|#'     ],
-    [ 'wget',     ' >='       ],
-    [ 'stick',    ' -\|/-\|'  ],
-    [ 'bullet',   ' ◦·●◎◯'    ],
-    [ 'beep',     ' · · #'    ],
+    [ 'smooth',   tuple(' ▏▎▍▌▋▊▉█') ],
+    [ 'vertical', tuple(' ▁▂▃▄▅▆▇█') ],
+    [ 'corners',  tuple(' ▖▌▛█')     ],
+    [ 'shaded',   tuple(' ░▒▓█')     ],
+    [ 'ascii',    tuple(' .:|#')     ],
+    [ 'wget',     tuple(' >=')       ],
+    [ 'stick',    tuple(' -\|/-\|')  ],
+    [ 'bullet',   tuple(' ◦·●◎◯')    ],
+    [ 'beep',     tuple(' · · #')    ],
 ])
 
+_IS_WIN = sys.platform == 'win32'
+# the terminal size syscall runs once, not once per printed frame; on
+# resize the cached width is invalidated by SIGWINCH
+_terminal_width = None
+_last_frame = None
+# bound once; OutputSuppressor redirects the fd underneath, not the object
+_stdout_write = sys.stdout.write
+_stdout_flush = sys.stdout.flush
+
+def _invalidate_terminal_width(*_):
+    global _terminal_width
+    _terminal_width = None
+
+if hasattr(signal, 'SIGWINCH'):
+    try:
+        signal.signal(signal.SIGWINCH, _invalidate_terminal_width)
+    except ValueError:  # not in the main thread
+        pass
+
 (PROGRESS_SMOOTH,
 PROGRESS_VERTICAL,
 PROGRESS_CORNERS,
@@ -57,10 +78,13 @@ def progress_bar(progress, total, style=PROGRESS_SMOOTH):
     ...     progress_bar(i, 1000-1, style=PROGRESS_VERTICAL)
     ...     time.sleep(0.002)  # do some work
     '''
+    global _terminal_width, _last_frame
     clear_line = '\033[2K\r'
     border_width = 2
     percentage_width = 7
-    total_width = os.get_terminal_size().columns
+    if _terminal_width is None:
+        _terminal_width = os.get_terminal_size().columns
+    total_width = _terminal_width
     bar_width = total_width - border_width - percentage_width - 1
     fraction = min(1.0, progress / total)
     if -(border_width + percentage_width) < bar_width <= 0:
@@ -77,7 +101,7 @@ def progress_bar(progress, total, style=PROGRESS_SMOOTH):
         except Exception as e:
             raise ValueError("Progress bar: Meter style {!r} is incompatible ({})".format(style, e))
     
-    if sys.platform == 'win32':
+    if _IS_WIN:
         clear_line = '\r' + ' ' * (total_width-1) + '\r'
         bar_width -= 1  # One less because the CMD cursor is behind the line, not on the last char.
         # Set CMD to UTF-8 with this command:
@@ -86,24 +110,34 @@ def progress_bar(progress, total, style=PROGRESS_SMOOTH):
         # So we use ASCII-only for Windows:
         meter = METERS['ascii']
     
-    greater_fraction = math.floor(bar_width * fraction)
-    lesser_fraction = math.floor(((bar_width * fraction) % 1) * len(meter)) if len(meter) > 3 else 1
-    print(
-        '{clear}|{done}{part_done}{todo}|{percentage: >7.2%}'.format(
-            clear=clear_line,
-            done=greater_fraction * meter[-1],
-            part_done=meter[lesser_fraction] if fraction < 1.0 else '',
-            todo=meter[0] * (bar_width - greater_fraction - 1),
-            percentage=fraction,
-        ),
-        end=''
-    )
+    # one scaled integer divmod instead of two floating-point floors
+    meter_length = len(meter)
+    greater_fraction, lesser_fraction = divmod(int(bar_width * fraction * meter_length), meter_length)
+    if meter_length <= 3:
+        lesser_fraction = 1
+    meter_full = meter[-1]
+    meter_empty = meter[0]
+    # skip frames that would render exactly like the previous one
+    percentage = '{: >7.2%}'.format(fraction)
+    previous_frame = _last_frame
+    frame = (style, bar_width, greater_fraction, lesser_fraction, percentage)
+    if frame == previous_frame:
+        return
+    _last_frame = frame
+    part_done = meter[lesser_fraction] if fraction < 1.0 else ''
+    todo = meter_empty * (bar_width - greater_fraction - 1)
+    _stdout_write(f'{clear_line}|{meter_full * greater_fraction}{part_done}{todo}|{percentage}')
+    # flush on visible bar movement and on completion, not per tick
+    if fraction >= 1.0 or previous_frame is None or greater_fraction != previous_frame[2]:
+        _stdout_flush()
 
 
 def progress_bar_clear():
     '''Clear the progress bar, but don't go to the next line.'''
-    clear_line = '\033[2K\r'
-    print('{clear}'.format(clear=clear_line), end='')
+    global _last_frame
+    _last_frame = None
+    _stdout_write('\033[2K\r')
+    _stdout_flush()
 
 
 if __name__ == '__main__':